@@ -0,0 +1,54 @@
+"""Add product listing indexes
+
+Revision ID: 8c1d2e7f4a90
+Revises: 3f2baf381a41
+Create Date: 2026-10-15 10:12:41.208113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c1d2e7f4a90'
+down_revision = '3f2baf381a41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 1. Índice composto para a listagem padrão (is_active + created_at DESC)
+    op.create_index(
+        'ix_product_active_created',
+        'products',
+        ['is_active', sa.text('created_at DESC')],
+        unique=False
+    )
+
+    # 2. Extensão pg_trgm para tornar ILIKE '%termo%' indexável
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # 3. Índices GIN de trigramas para busca parcial em name e sku
+    op.create_index(
+        'ix_product_name_trgm',
+        'products',
+        ['name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_product_sku_trgm',
+        'products',
+        ['sku'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'sku': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_product_sku_trgm', table_name='products')
+    op.drop_index('ix_product_name_trgm', table_name='products')
+    op.drop_index('ix_product_active_created', table_name='products')
+    # A extensão pg_trgm é mantida: pode ser usada por outros objetos do banco
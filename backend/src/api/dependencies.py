@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from fastapi import Depends
 
 from src.infrastructure.database.connection import get_db
+from src.infrastructure.cache.memory_cache import InMemoryTTLCache
 
 # Repositórios
 from src.infrastructure.repositories.product_repository import ProductRepository
@@ -23,6 +24,10 @@ from src.application.interfaces.repositories import (
 from src.application.use_cases.order_use_cases import OrderUseCases 
 
 
+# Cache de pedidos por chave de idempotência (compartilhado pelo processo)
+idempotency_cache = InMemoryTTLCache()
+
+
 # --- Funções de Injeção de Dependência para Repositórios ---
 
 def get_product_repository(db: Session = Depends(get_db)) -> IProductRepository:
@@ -43,7 +48,7 @@ def get_order_repository(db: Session = Depends(get_db)) -> IOrderRepository:
     """
     Retorna instância do repositório de pedidos.
     """
-    return OrderRepository(db)
+    return OrderRepository(db, cache=idempotency_cache)
 
 
 # --- Função de Injeção de Dependência para Use Cases ---
@@ -58,7 +63,7 @@ def get_order_use_cases(
     """
     # As classes OrderRepository, ProductRepository, CustomerRepository já estão importadas.
     
-    order_repo = OrderRepository(db)
+    order_repo = OrderRepository(db, cache=idempotency_cache)
     product_repo = ProductRepository(db)
     customer_repo = CustomerRepository(db)
     
@@ -67,6 +67,18 @@ class ICustomerRepository(ABC):
         """Lista clientes com paginação."""
         pass
     
+    @abstractmethod
+    def list_all_projection(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        name: Optional[str] = None,
+        email: Optional[str] = None,
+        document: Optional[str] = None
+    ) -> tuple[List[dict], int]:
+        """Lista clientes com paginação e filtros, retornando (dicts somente leitura, total)."""
+        pass
+    
     @abstractmethod
     def update(self, customer: CustomerEntity) -> CustomerEntity:
         """Atualiza um cliente."""
@@ -96,6 +108,11 @@ class IOrderRepository(ABC):
         """Busca pedido por chave de idempotência."""
         pass
     
+    @abstractmethod
+    def lock_idempotency_key(self, idempotency_key: str) -> None:
+        """Bloqueia a chave de idempotência até o fim da transação corrente."""
+        pass
+    
     @abstractmethod
     def list_all(self, skip: int = 0, limit: int = 20, customer_id: Optional[int] = None) -> List[OrderEntity]:
         """Lista pedidos com paginação e filtros."""
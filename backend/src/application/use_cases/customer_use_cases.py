@@ -133,7 +133,7 @@ class CustomerUseCases:
         
         # Buscar clientes
         # ⚠️ CHAMADA AO REPOSITÓRIO CORRIGIDA: Incluindo os filtros
-        customers, total = self.customer_repository.list_all(
+        customers, total = self.customer_repository.list_all_projection(
             skip=skip,
             limit=page_size,
             name=name,
@@ -144,7 +144,7 @@ class CustomerUseCases:
         # Calcular total de páginas
         total_pages = math.ceil(total / page_size) if total > 0 else 0
         
-        # Converter entities para DTOs
+        # Converter linhas projetadas para DTOs
         items = [CustomerResponse.model_validate(c) for c in customers]
         
         return CustomerListResponse(
@@ -1,4 +1,4 @@
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from decimal import Decimal
 from sqlalchemy.orm import Session
 
@@ -15,6 +15,7 @@ from src.application.interfaces.repositories import (
 )
 from src.domain.entities.order import OrderEntity
 from src.domain.entities.order_item import OrderItemEntity
+from src.domain.entities.product import ProductEntity
 from src.domain.exceptions.business_exceptions import (
     OrderNotFoundException,
     ProductNotFoundException,
@@ -61,6 +62,11 @@ class OrderUseCases:
         )
         
         existing_order = self.order_repository.get_by_idempotency_key(idempotency_key)
+        if not existing_order:
+            # Serializa requisições concorrentes com a mesma chave e confere de novo
+            self.order_repository.lock_idempotency_key(idempotency_key)
+            existing_order = self.order_repository.get_by_idempotency_key(idempotency_key)
+        
         if existing_order:
             logger.warning(
                 "Pedido com mesma idempotency_key já existe",
@@ -94,8 +100,13 @@ class OrderUseCases:
             items_entities = []
             total_amount = Decimal("0.00")
             
+            # Produtos buscados uma única vez (reaproveitados na baixa de estoque)
+            products: Dict[int, ProductEntity] = {}
+            
             for item_data in order_data.items:
-                product = self.product_repository.get_by_id(item_data.product_id)
+                product = products.get(item_data.product_id)
+                if product is None:
+                    product = self.product_repository.get_by_id(item_data.product_id)
                 
                 if not product:
                     logger.error(
@@ -145,6 +156,7 @@ class OrderUseCases:
                 )
                 item_entity.validate()
                 items_entities.append(item_entity)
+                products[item_data.product_id] = product
             
             order_entity = OrderEntity(
                 id=None,
@@ -159,7 +171,7 @@ class OrderUseCases:
             created_order = self.order_repository.create(order_entity)
             
             for item_data in order_data.items:
-                product = self.product_repository.get_by_id(item_data.product_id)
+                product = products[item_data.product_id]
                 product.stock_qty -= item_data.quantity
                 self.product_repository.update(product)
             
@@ -16,6 +16,9 @@ class Settings(BaseSettings):
     
     # Banco de Dados
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 20        # Conexões mantidas abertas no pool
+    DB_MAX_OVERFLOW: int = 10     # Conexões extras em picos de carga
+    DB_POOL_RECYCLE: int = 1800   # Recicla conexões após N segundos
     
     # Aplicação
     APP_NAME: str = "TopSaude Hub API"
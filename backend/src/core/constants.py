@@ -32,4 +32,7 @@ ERROR_MESSAGES = {
 
 # Configurações de paginação
 DEFAULT_PAGE_SIZE = 20
-MAX_PAGE_SIZE = 100
\ No newline at end of file
+MAX_PAGE_SIZE = 100
+
+# Tempo (segundos) que um pedido fica em cache pela chave de idempotência
+IDEMPOTENCY_CACHE_TTL = 300
@@ -2,7 +2,7 @@
 Entidade Customer do domínio.
 """
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 import re
 
 
@@ -12,6 +12,10 @@ class CustomerEntity:
     Contém regras de negócio relacionadas a clientes.
     """
     
+    # Regexes compiladas uma única vez (na definição da classe)
+    _EMAIL_REGEX = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+    _NON_DIGIT_REGEX = re.compile(r'[^0-9]')
+    
     def __init__(
         self,
         id: Optional[int],
@@ -30,6 +34,22 @@ class CustomerEntity:
         self.created_at = created_at
         self.updated_at = updated_at
     
+    @classmethod
+    def from_model(cls, model: Any) -> "CustomerEntity":
+        """
+        Cria a entidade a partir de um objeto com os mesmos atributos
+        (ex.: model do ORM), sem passar pelo despacho de kwargs do __init__.
+        """
+        obj = cls.__new__(cls)
+        obj.id = model.id
+        obj.name = model.name
+        obj.email = model.email
+        obj.document = model.document
+        obj.is_active = model.is_active
+        obj.created_at = model.created_at
+        obj.updated_at = model.updated_at
+        return obj
+    
     def validate(self) -> None:
         """Valida regras de negócio do cliente."""
         if not self.name or len(self.name.strip()) == 0:
@@ -41,22 +61,24 @@ class CustomerEntity:
         if not self.is_valid_document(self.document):
             raise ValueError("Documento inválido (CPF ou CNPJ)")
     
-    @staticmethod
-    def is_valid_email(email: str) -> bool:
+    @classmethod
+    def is_valid_email(cls, email: str) -> bool:
         """Valida formato de email."""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email))
+        # Pré-filtro barato: email válido tem exatamente um '@'
+        if email.count('@') != 1:
+            return False
+        return bool(cls._EMAIL_REGEX.match(email))
     
-    @staticmethod
-    def is_valid_document(document: str) -> bool:
+    @classmethod
+    def is_valid_document(cls, document: str) -> bool:
         """Valida CPF ou CNPJ (apenas números)."""
         # Remove caracteres não numéricos
-        doc = re.sub(r'[^0-9]', '', document)
+        doc = cls._NON_DIGIT_REGEX.sub('', document)
         
         # CPF tem 11 dígitos, CNPJ tem 14
         return len(doc) in [11, 14]
     
-    @staticmethod
-    def format_document(document: str) -> str:
+    @classmethod
+    def format_document(cls, document: str) -> str:
         """Formata documento removendo caracteres especiais."""
-        return re.sub(r'[^0-9]', '', document)
\ No newline at end of file
+        return cls._NON_DIGIT_REGEX.sub('', document)
\ No newline at end of file
@@ -49,7 +49,7 @@ class OrderEntity:
         if self.total_amount < 0:
             raise ValueError("Valor total não pode ser negativo")
         
-        if self.status not in [s.value for s in OrderStatus]:
+        if self.status not in OrderStatus._value2member_map_:
             raise ValueError(f"Status inválido: {self.status}")
         
         if not self.items or len(self.items) == 0:
@@ -0,0 +1,64 @@
+"""
+Cache em memória com expiração (TTL).
+
+Usado para evitar idas ao banco em consultas muito repetidas, como a
+busca de pedidos pela chave de idempotência (retries do cliente).
+A interface (get/setex/delete) segue a do Redis, permitindo trocar
+por um cliente Redis sem alterar os repositórios.
+"""
+import copy
+import threading
+import time
+from typing import Any, Optional
+
+
+class InMemoryTTLCache:
+    """
+    Cache chave/valor em memória do processo, com TTL por entrada.
+    
+    Os valores são copiados na leitura e na escrita, para que objetos
+    mutáveis (entidades) não sejam compartilhados entre requisições.
+    """
+    
+    def __init__(self, maxsize: int = 1024):
+        """
+        Inicializa o cache.
+        
+        Args:
+            maxsize: Número máximo de entradas (as mais antigas são descartadas)
+        """
+        self.maxsize = maxsize
+        self._data: dict[str, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Retorna o valor armazenado ou None se ausente/expirado."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+        return copy.deepcopy(value)
+    
+    def setex(self, key: str, ttl: int, value: Any) -> None:
+        """Armazena o valor por `ttl` segundos."""
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._data.pop(key, None)
+            if len(self._data) >= self.maxsize:
+                # Descarta a entrada mais antiga (ordem de inserção do dict)
+                del self._data[next(iter(self._data))]
+            self._data[key] = (time.monotonic() + ttl, value)
+    
+    def delete(self, key: str) -> None:
+        """Remove a chave do cache, se existir."""
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self) -> None:
+        """Remove todas as entradas."""
+        with self._lock:
+            self._data.clear()
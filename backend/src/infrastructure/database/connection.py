@@ -2,16 +2,27 @@
 Configuração da conexão com o banco de dados.
 """
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 from src.core.config import settings
 
+# Opções específicas do driver PostgreSQL (psycopg2)
+_dialect_options = {}
+if make_url(settings.DATABASE_URL).get_driver_name() == "psycopg2":
+    # Agrupa executemany em INSERT/UPDATE com múltiplos VALUES
+    # (só o psycopg2 aceita executemany_mode; psycopg/asyncpg rejeitam a opção)
+    _dialect_options["executemany_mode"] = "values_plus_batch"
+
 # Engine do SQLAlchemy
 engine = create_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,  # Log de queries SQL em modo debug
     pool_pre_ping=True,   # Verifica conexão antes de usar
-    pool_size=10,         # Pool de conexões
-    max_overflow=20       # Conexões extras permitidas
+    pool_size=settings.DB_POOL_SIZE,          # Pool de conexões
+    max_overflow=settings.DB_MAX_OVERFLOW,    # Conexões extras permitidas
+    pool_recycle=settings.DB_POOL_RECYCLE,    # Evita conexões derrubadas pelo servidor
+    query_cache_size=1200,  # Cache de SQL compilado compartilhado pelo pool
+    **_dialect_options
 )
 
 # Session factory
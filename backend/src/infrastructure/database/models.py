@@ -29,6 +29,17 @@ class Product(Base):
     # Índices compostos
     __table_args__ = (
         Index('idx_product_active_sku', 'is_active', 'sku'),
+        # Listagem padrão: filtro por is_active + ordenação por created_at DESC
+        Index('ix_product_active_created', 'is_active', created_at.desc()),
+        # Busca parcial (ILIKE '%termo%') em name/sku via pg_trgm
+        Index(
+            'ix_product_name_trgm', 'name',
+            postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}
+        ),
+        Index(
+            'ix_product_sku_trgm', 'sku',
+            postgresql_using='gin', postgresql_ops={'sku': 'gin_trgm_ops'}
+        ),
     )
 
     def __repr__(self):
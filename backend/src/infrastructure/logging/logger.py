@@ -12,10 +12,20 @@ import logging
 import sys
 from typing import Any
 
+import orjson
 import structlog
 from structlog.types import EventDict, Processor
 
 
+def _orjson_dumps(obj: Any, **kwargs: Any) -> str:
+    """
+    Serializa com orjson e devolve str (o logging padrão espera texto, não bytes).
+    Aceita chaves não-str em dicts (OPT_NON_STR_KEYS), como o json da stdlib.
+    """
+    option = kwargs.pop("option", 0) | orjson.OPT_NON_STR_KEYS
+    return orjson.dumps(obj, option=option, **kwargs).decode()
+
+
 def add_app_context(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
     """
     Adiciona contexto da aplicação aos logs.
@@ -78,8 +88,8 @@ def configure_structlog(log_level: str = "INFO", json_logs: bool = False) -> Non
     
     # Escolher formato final baseado no ambiente
     if json_logs:
-        # Produção: JSON
-        processors.append(structlog.processors.JSONRenderer())
+        # Produção: JSON (serializado com orjson)
+        processors.append(structlog.processors.JSONRenderer(serializer=_orjson_dumps))
     else:
         # Desenvolvimento: Colorido e legível
         processors.append(
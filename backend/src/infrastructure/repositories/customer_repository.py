@@ -16,6 +16,17 @@ from src.domain.exceptions.business_exceptions import (
     DuplicateDocumentException
 )
 
+# Colunas retornadas na listagem (projeção sem hidratação do ORM)
+_LIST_COLUMNS = (
+    Customer.id,
+    Customer.name,
+    Customer.email,
+    Customer.document,
+    Customer.is_active,
+    Customer.created_at,
+    Customer.updated_at,
+)
+
 
 class CustomerRepository(ICustomerRepository):
     """Implementação do repositório de clientes usando SQLAlchemy."""
@@ -69,8 +80,44 @@ class CustomerRepository(ICustomerRepository):
         document: Optional[str] = None
     ) -> tuple[List[CustomerEntity], int]:
         
-        query = self.db.query(Customer)
+        query = self._filtered_query(self.db.query(Customer), name, email, document)
+        
+        total = query.count()
+        db_customers = query.offset(skip).limit(limit).all()
         
+        customers = [self._to_entity(c) for c in db_customers]
+        return customers, total
+
+    def list_all_projection(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        name: Optional[str] = None,
+        email: Optional[str] = None,
+        document: Optional[str] = None
+    ) -> tuple[List[dict], int]:
+        """
+        Variante somente leitura do list_all para endpoints de listagem.
+        Busca apenas as colunas necessárias e devolve dicts, sem hidratar
+        models do ORM nem construir entidades.
+        """
+        query = self._filtered_query(
+            self.db.query(Customer).with_entities(*_LIST_COLUMNS),
+            name, email, document
+        )
+        
+        total = query.count()
+        rows = query.offset(skip).limit(limit).all()
+        
+        return [row._asdict() for row in rows], total
+
+    def _filtered_query(
+        self,
+        query,
+        name: Optional[str],
+        email: Optional[str],
+        document: Optional[str]
+    ):
         # ⚠️ APLICAÇÃO DO FILTROS USANDO iLIKE (busca case-insensitive)
         if name:
             query = query.filter(Customer.name.ilike(f"%{name}%"))
@@ -82,11 +129,7 @@ class CustomerRepository(ICustomerRepository):
             cleaned_document = CustomerEntity.format_document(document)
             query = query.filter(Customer.document.ilike(f"%{cleaned_document}%"))
         
-        total = query.count()
-        db_customers = query.offset(skip).limit(limit).all()
-        
-        customers = [self._to_entity(c) for c in db_customers]
-        return customers, total
+        return query
 
 
     # -------------------------------------------------------------
@@ -137,11 +180,4 @@ class CustomerRepository(ICustomerRepository):
         return True
     
     def _to_entity(self, db_customer: Customer) -> CustomerEntity:
-        return CustomerEntity(
-            id=db_customer.id,
-            name=db_customer.name,
-            email=db_customer.email,
-            document=db_customer.document,
-            created_at=db_customer.created_at,
-            updated_at=db_customer.updated_at
-        )
+        return CustomerEntity.from_model(db_customer)
@@ -2,20 +2,41 @@
 Implementação concreta do repositório de pedidos.
 Responsável por todas as operações de banco de dados relacionadas a pedidos.
 """
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from operator import attrgetter
+from typing import Any, List, Optional
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session, selectinload
 from src.application.interfaces.repositories import IOrderRepository
 from src.domain.entities.order import OrderEntity
 from src.domain.entities.order_item import OrderItemEntity
 from src.infrastructure.database.models import Order, OrderItem
 from src.domain.exceptions.business_exceptions import OrderNotFoundException
+from src.core.constants import IDEMPOTENCY_CACHE_TTL
+
+# Campos lidos do ORM na mesma ordem dos parâmetros posicionais das entidades
+_ORDER_FIELDS = attrgetter(
+    "id", "customer_id", "total_amount", "status",
+    "idempotency_key", "created_at", "updated_at"
+)
+_ORDER_ITEM_FIELDS = attrgetter(
+    "id", "order_id", "product_id", "unit_price", "quantity", "line_total"
+)
 
 
 class OrderRepository(IOrderRepository):
     """Implementação do repositório de pedidos usando SQLAlchemy."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, cache: Optional[Any] = None):
+        """
+        Inicializa o repositório.
+        
+        Args:
+            db: Sessão do banco de dados injetada
+            cache: Cache opcional (interface get/setex) para buscas por
+                chave de idempotência
+        """
         self.db = db
+        self.cache = cache
     
     def create(self, order: OrderEntity) -> OrderEntity:
         """
@@ -29,23 +50,36 @@ class OrderRepository(IOrderRepository):
                 status=order.status,
                 idempotency_key=order.idempotency_key
             )
+            # O flush emite INSERT ... RETURNING (id e created_at vêm na mesma ida)
             self.db.add(db_order)
             self.db.flush()
             
-            for item in order.items:
-                db_item = OrderItem(
-                    order_id=db_order.id,
-                    product_id=item.product_id,
-                    unit_price=item.unit_price,
-                    quantity=item.quantity,
-                    line_total=item.line_total
-                )
-                self.db.add(db_item)
+            # Insere todos os itens de uma vez, já devolvendo as linhas criadas
+            db_items = []
+            if order.items:
+                db_items = self.db.scalars(
+                    insert(OrderItem).returning(OrderItem, sort_by_parameter_order=True),
+                    [
+                        {
+                            "order_id": db_order.id,
+                            "product_id": item.product_id,
+                            "unit_price": item.unit_price,
+                            "quantity": item.quantity,
+                            "line_total": item.line_total
+                        }
+                        for item in order.items
+                    ]
+                ).all()
             
+            # Monta a entity antes do commit: dispensa o refresh (SELECT extra)
+            created = OrderEntity(
+                *_ORDER_FIELDS(db_order),
+                items=[OrderItemEntity(*_ORDER_ITEM_FIELDS(db_item)) for db_item in db_items]
+            )
             self.db.commit()
-            self.db.refresh(db_order)
             
-            return self._to_entity(db_order)
+            self._cache_order(created)
+            return created
         
         except Exception as e:
             self.db.rollback()
@@ -53,17 +87,40 @@ class OrderRepository(IOrderRepository):
     
     def get_by_id(self, order_id: int) -> Optional[OrderEntity]:
         """Busca um pedido por ID."""
-        db_order = self.db.query(Order).filter(Order.id == order_id).first()
+        db_order = self.db.get(Order, order_id, options=[selectinload(Order.items)])
         if not db_order:
             return None
         return self._to_entity(db_order)
     
     def get_by_idempotency_key(self, idempotency_key: str) -> Optional[OrderEntity]:
-        """Busca um pedido pela chave de idempotência."""
-        db_order = self.db.query(Order).filter(Order.idempotency_key == idempotency_key).first()
+        """Busca um pedido pela chave de idempotência (consulta o cache antes do banco)."""
+        if self.cache is not None:
+            cached = self.cache.get(self._cache_key(idempotency_key))
+            if cached is not None:
+                return cached
+        
+        db_order = (
+            self.db.query(Order)
+            .options(selectinload(Order.items))
+            .filter(Order.idempotency_key == idempotency_key)
+            .first()
+        )
         if not db_order:
             return None
-        return self._to_entity(db_order)
+        
+        order = self._to_entity(db_order)
+        self._cache_order(order)
+        return order
+    
+    def lock_idempotency_key(self, idempotency_key: str) -> None:
+        """
+        Adquire um advisory lock de transação para a chave de idempotência.
+        Requisições concorrentes com a mesma chave aguardam aqui até o commit
+        (ou rollback) de quem chegou primeiro.
+        """
+        self.db.execute(
+            select(func.pg_advisory_xact_lock(func.hashtext(idempotency_key)))
+        )
     
     def list_all(
         self, 
@@ -75,54 +132,61 @@ class OrderRepository(IOrderRepository):
         Lista pedidos com paginação.
         Retorna tupla (lista_de_pedidos, total_de_registros).
         """
-        query = self.db.query(Order)
-        
+        filters = []
         if customer_id:
-            query = query.filter(Order.customer_id == customer_id)
+            filters.append(Order.customer_id == customer_id)
+        
+        # Total vem na própria página via COUNT(*) OVER () (uma única query)
+        # e os itens são carregados em uma única query extra (evita N+1)
+        stmt = (
+            select(Order, func.count().over().label("total"))
+            .where(*filters)
+            .options(selectinload(Order.items))
+            .offset(skip)
+            .limit(limit)
+        )
+        rows = self.db.execute(stmt).all()
+        
+        if rows:
+            total = rows[0].total
+        elif skip:
+            # Página além do fim: a janela não traz o total, conta à parte
+            total = self.db.scalar(select(func.count()).select_from(Order).where(*filters))
+        else:
+            total = 0
         
-        total = query.count()
-        db_orders = query.offset(skip).limit(limit).all()
+        db_orders = [row[0] for row in rows]
         
         return [self._to_entity(o) for o in db_orders], total
     
     def update(self, order: OrderEntity) -> OrderEntity:
         """Atualiza um pedido existente."""
-        db_order = self.db.query(Order).filter(Order.id == order.id).first()
+        # UPDATE direto, sem carregar o pedido antes (uma única ida ao banco)
+        result = self.db.execute(
+            update(Order)
+            .where(Order.id == order.id)
+            .values(status=order.status, updated_at=order.updated_at)
+        )
         
-        if not db_order:
+        if result.rowcount == 0:
             raise OrderNotFoundException(f"Pedido {order.id} não encontrado")
         
-        db_order.status = order.status
-        db_order.updated_at = order.updated_at
-        
         self.db.commit()
-        self.db.refresh(db_order)
+        # Mantém o cache coerente com o novo status
+        self._cache_order(order)
         
-        return self._to_entity(db_order)
+        return order
+    
+    @staticmethod
+    def _cache_key(idempotency_key: str) -> str:
+        return f"idem:{idempotency_key}"
+    
+    def _cache_order(self, order: OrderEntity) -> None:
+        """Armazena o pedido no cache pela chave de idempotência, se houver."""
+        if self.cache is not None and order.idempotency_key:
+            self.cache.setex(self._cache_key(order.idempotency_key), IDEMPOTENCY_CACHE_TTL, order)
     
     def _to_entity(self, db_order: Order) -> OrderEntity:
         """Converte modelo ORM para entidade de domínio."""
-        items = []
-        
-        for db_item in db_order.items:
-            items.append(
-                OrderItemEntity(
-                    id=db_item.id,
-                    order_id=db_item.order_id,
-                    product_id=db_item.product_id,
-                    unit_price=db_item.unit_price,
-                    quantity=db_item.quantity,
-                    line_total=db_item.line_total
-                )
-            )
-        
-        return OrderEntity(
-            id=db_order.id,
-            customer_id=db_order.customer_id,
-            total_amount=db_order.total_amount,
-            status=db_order.status,
-            idempotency_key=db_order.idempotency_key,
-            created_at=db_order.created_at,
-            updated_at=db_order.updated_at,
-            items=items
-        )
\ No newline at end of file
+        items = [OrderItemEntity(*_ORDER_ITEM_FIELDS(db_item)) for db_item in db_order.items]
+        return OrderEntity(*_ORDER_FIELDS(db_order), items=items)
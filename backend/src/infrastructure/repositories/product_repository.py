@@ -2,9 +2,11 @@
 Implementação concreta do repositório de produtos.
 Responsável por todas as operações de banco de dados relacionadas a produtos.
 """
+from operator import attrgetter
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import exists, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from src.application.interfaces.repositories import IProductRepository
 from src.domain.entities.product import ProductEntity
 from src.infrastructure.database.models import Product
@@ -13,6 +15,32 @@ from src.domain.exceptions.business_exceptions import (
     DuplicateSKUException
 )
 
+# Campos lidos do ORM na mesma ordem dos parâmetros posicionais de ProductEntity
+_PRODUCT_FIELDS = attrgetter(
+    "id", "name", "sku", "price", "stock_qty",
+    "is_active", "created_at", "updated_at"
+)
+
+# Colunas retornadas na listagem (projeção sem hidratação do ORM)
+_LIST_COLUMNS = (
+    Product.id,
+    Product.name,
+    Product.sku,
+    Product.price,
+    Product.stock_qty,
+    Product.is_active,
+    Product.created_at,
+    Product.updated_at,
+)
+
+# Colunas permitidas para ordenação na listagem
+_ORDER_COLUMNS = {
+    "created_at": Product.created_at,
+    "name": Product.name,
+    "price": Product.price,
+    "stock_qty": Product.stock_qty,
+}
+
 
 class ProductRepository(IProductRepository):
     """Implementação do repositório de produtos usando SQLAlchemy."""
@@ -39,27 +67,30 @@ class ProductRepository(IProductRepository):
         Raises:
             DuplicateSKUException: Se o SKU já existe
         """
-        # Verificar se SKU já existe
-        existing = self.db.query(Product).filter(Product.sku == product.sku).first()
-        if existing:
-            raise DuplicateSKUException(f"SKU '{product.sku}' já existe")
-        
-        # Criar model do ORM
-        db_product = Product(
-            name=product.name,
-            sku=product.sku,
-            price=product.price,
-            stock_qty=product.stock_qty,
-            is_active=product.is_active
+        # INSERT ... ON CONFLICT (sku) DO NOTHING RETURNING:
+        # a unicidade é garantida pelo índice único, em uma única ida ao banco
+        stmt = (
+            pg_insert(Product)
+            .values(
+                name=product.name,
+                sku=product.sku,
+                price=product.price,
+                stock_qty=product.stock_qty,
+                is_active=product.is_active
+            )
+            .on_conflict_do_nothing(index_elements=[Product.sku])
+            .returning(Product)
         )
+        db_product = self.db.scalars(stmt).first()
         
-        # Salvar no banco
-        self.db.add(db_product)
+        if db_product is None:
+            raise DuplicateSKUException(f"SKU '{product.sku}' já existe")
+        
+        # Converter para entity antes do commit (evita recarregar o model expirado)
+        created = self._to_entity(db_product)
         self.db.commit()
-        self.db.refresh(db_product)
         
-        # Converter de volta para entity
-        return self._to_entity(db_product)
+        return created
     
     def get_by_id(self, product_id: int) -> Optional[ProductEntity]:
         """
@@ -71,7 +102,7 @@ class ProductRepository(IProductRepository):
         Returns:
             ProductEntity se encontrado, None caso contrário
         """
-        db_product = self.db.query(Product).filter(Product.id == product_id).first()
+        db_product = self.db.get(Product, product_id)
         
         if not db_product:
             return None
@@ -120,34 +151,48 @@ class ProductRepository(IProductRepository):
         Returns:
             Tupla (lista de produtos, total de registros)
         """
-        # Query base
-        query = self.db.query(Product)
-        
         # Aplicar filtros
+        filters = []
         if is_active is not None:
-            query = query.filter(Product.is_active == is_active)
+            filters.append(Product.is_active == is_active)
         
         if name_filter:
-            query = query.filter(Product.name.ilike(f"%{name_filter}%"))
+            filters.append(Product.name.ilike(f"%{name_filter}%"))
         
         if sku_filter:
-            query = query.filter(Product.sku.ilike(f"%{sku_filter}%"))
-        
-        # Contar total antes de paginar
-        total = query.count()
+            filters.append(Product.sku.ilike(f"%{sku_filter}%"))
         
-        # Aplicar ordenação
-        order_column = getattr(Product, order_by, Product.created_at)
+        # Aplicar ordenação (campos fora da whitelist caem em created_at)
+        order_column = _ORDER_COLUMNS.get(order_by) or Product.created_at
         if order_direction.lower() == "desc":
-            query = query.order_by(order_column.desc())
+            order_clause = order_column.desc()
         else:
-            query = query.order_by(order_column.asc())
+            order_clause = order_column.asc()
+        
+        # Total calculado na mesma query via COUNT(*) OVER ()
+        stmt = (
+            select(*_LIST_COLUMNS, func.count().over().label("total"))
+            .where(*filters)
+            .order_by(order_clause)
+            .offset(skip)
+            .limit(limit)
+        )
+        rows = self.db.execute(stmt).mappings().all()
         
-        # Aplicar paginação
-        db_products = query.offset(skip).limit(limit).all()
+        if rows:
+            total = rows[0]["total"]
+        elif skip:
+            # Página além do fim: a janela não traz o total, conta à parte
+            total = self.db.scalar(select(func.count()).select_from(Product).where(*filters))
+        else:
+            total = 0
         
-        # Converter para entities
-        products = [self._to_entity(p) for p in db_products]
+        # Converter linhas projetadas direto para entities
+        products = []
+        for row in rows:
+            data = dict(row)
+            data.pop("total")
+            products.append(ProductEntity(**data))
         
         return products, total
     
@@ -165,33 +210,36 @@ class ProductRepository(IProductRepository):
             ProductNotFoundException: Se o produto não existe
             DuplicateSKUException: Se o novo SKU já existe em outro produto
         """
-        # Buscar produto existente
-        db_product = self.db.query(Product).filter(Product.id == product.id).first()
-        
-        if not db_product:
-            raise ProductNotFoundException(f"Produto com ID {product.id} não encontrado")
-        
-        # Verificar se o novo SKU já existe em outro produto
-        if product.sku != db_product.sku:
-            existing = self.db.query(Product).filter(
+        # Verificar se o SKU já existe em outro produto (EXISTS, sem carregar a linha)
+        sku_conflict = self.db.scalar(
+            select(exists().where(
                 Product.sku == product.sku,
                 Product.id != product.id
-            ).first()
-            
-            if existing:
-                raise DuplicateSKUException(f"SKU '{product.sku}' já existe em outro produto")
-        
-        # Atualizar campos
-        db_product.name = product.name
-        db_product.sku = product.sku
-        db_product.price = product.price
-        db_product.stock_qty = product.stock_qty
-        db_product.is_active = product.is_active
-        
-        # Salvar alterações
-        self.db.flush()
+            ))
+        )
+        
+        if sku_conflict:
+            raise DuplicateSKUException(f"SKU '{product.sku}' já existe em outro produto")
+        
+        # Atualizar campos com um único UPDATE (sem carregar o produto antes);
+        # RETURNING devolve a linha já gravada, incluindo o updated_at do onupdate
+        row = self.db.execute(
+            update(Product)
+            .where(Product.id == product.id)
+            .values(
+                name=product.name,
+                sku=product.sku,
+                price=product.price,
+                stock_qty=product.stock_qty,
+                is_active=product.is_active
+            )
+            .returning(*_LIST_COLUMNS)
+        ).mappings().first()
+        
+        if row is None:
+            raise ProductNotFoundException(f"Produto com ID {product.id} não encontrado")
       
-        return self._to_entity(db_product)
+        return ProductEntity(**row)
     
     def delete(self, product_id: int) -> bool:
         """
@@ -203,16 +251,15 @@ class ProductRepository(IProductRepository):
         Returns:
             True se deletado, False se não encontrado
         """
-        db_product = self.db.query(Product).filter(Product.id == product_id).first()
-        
-        if not db_product:
-            return False
-        
-        # Soft delete - apenas marca como inativo
-        db_product.is_active = False
+        # Soft delete - apenas marca como inativo, num único UPDATE
+        result = self.db.execute(
+            update(Product)
+            .where(Product.id == product_id)
+            .values(is_active=False)
+        )
         self.db.commit()
         
-        return True
+        return result.rowcount > 0
     
     def _to_entity(self, db_product: Product) -> ProductEntity:
         """
@@ -224,13 +271,4 @@ class ProductRepository(IProductRepository):
         Returns:
             ProductEntity
         """
-        return ProductEntity(
-            id=db_product.id,
-            name=db_product.name,
-            sku=db_product.sku,
-            price=db_product.price,
-            stock_qty=db_product.stock_qty,
-            is_active=db_product.is_active,
-            created_at=db_product.created_at,
-            updated_at=db_product.updated_at
-        )
\ No newline at end of file
+        return ProductEntity(*_PRODUCT_FIELDS(db_product))
@@ -1,9 +1,12 @@
 """
 Arquivo principal da aplicação FastAPI.
 """
-from fastapi import FastAPI, Request
+from functools import lru_cache
+
+import orjson
+from fastapi import FastAPI, Request, Response
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from src.core.config import settings
 from src.api.routes import health, products, customers, orders
@@ -14,12 +17,13 @@ from src.infrastructure.logging.logger import configure_structlog, get_logger
 
 # Importar middleware de logging
 from src.api.middleware import LoggingMiddleware
+from src.infrastructure.database.connection import engine
 
 
 # Configurar logs estruturados ANTES de criar o app
 configure_structlog(
     log_level=settings.LOG_LEVEL,
-    json_logs=False  # False = logs coloridos (dev), True = JSON (prod)
+    json_logs=settings.ENVIRONMENT == "production"  # JSON em prod, colorido em dev
 )
 
 # Criar logger para este módulo
@@ -31,6 +35,7 @@ app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     debug=settings.DEBUG,
+    default_response_class=ORJSONResponse,  # Serialização JSON via orjson
 )
 
 # Configurar CORS
@@ -48,6 +53,72 @@ app.add_middleware(LoggingMiddleware)
 
 # ===== EXCEPTION HANDLERS =====
 
+def _label(field) -> str:
+    """Nome legível do campo (ex.: stock_qty -> Stock Qty)."""
+    return str(field).replace('_', ' ').title()
+
+
+_INVALID_JSON_MESSAGE = "Formato JSON inválido. Verifique a sintaxe dos dados enviados"
+
+# Mensagens customizadas por tipo de erro do Pydantic v2 (busca exata O(1)).
+# Cada formatter recebe (campo, ctx, mensagem_original).
+_VALIDATION_MESSAGES = {
+    # Erros de valor (greater_than, less_than, etc)
+    "greater_than": lambda f, ctx, msg: (
+        f"{_label(f)} deve ser maior que {ctx['gt']}" if 'gt' in ctx
+        else f"{_label(f)} deve ser positivo"
+    ),
+    "greater_than_equal": lambda f, ctx, msg: (
+        f"{_label(f)} deve ser maior ou igual a {ctx['ge']}" if 'ge' in ctx
+        else f"{_label(f)} não pode ser negativo"
+    ),
+    "less_than_equal": lambda f, ctx, msg: f"{_label(f)} excede o valor máximo permitido",
+    
+    # Erros de tipo
+    "string_type": lambda f, ctx, msg: f"{_label(f)} deve ser texto",
+    "int_type": lambda f, ctx, msg: f"{_label(f)} deve ser um número inteiro",
+    "integer_type": lambda f, ctx, msg: f"{_label(f)} deve ser um número inteiro",
+    "float_type": lambda f, ctx, msg: f"{_label(f)} deve ser um número",
+    "decimal_type": lambda f, ctx, msg: f"{_label(f)} deve ser um número",
+    "bool_type": lambda f, ctx, msg: f"{_label(f)} deve ser verdadeiro ou falso",
+    
+    # Erros de obrigatoriedade
+    "missing": lambda f, ctx, msg: f"Campo obrigatório: {str(f).replace('_', ' ')}",
+    
+    # Erros de string (tamanho)
+    "string_too_short": lambda f, ctx, msg: (
+        f"{_label(f)} deve ter no mínimo {ctx.get('min_length', 1)} caracteres"
+    ),
+    "string_too_long": lambda f, ctx, msg: (
+        f"{_label(f)} deve ter no máximo {ctx.get('max_length', 255)} caracteres"
+    ),
+    
+    # Erros de validação customizada (ValueError dos @field_validator)
+    "value_error": lambda f, ctx, msg: msg if msg else f"Erro de validação no campo {f}",
+    
+    # Erros de parsing do body
+    "json_invalid": lambda f, ctx, msg: _INVALID_JSON_MESSAGE,
+}
+
+# Tipos cuja mensagem depende do texto original do erro (não cacheáveis)
+_UNCACHED_VALIDATION_TYPES = frozenset({"value_error"})
+
+
+def _error_body(mensagem: str) -> bytes:
+    """Serializa o envelope padrão de erro."""
+    return orjson.dumps({"cod_retorno": 1, "mensagem": mensagem, "data": None})
+
+
+@lru_cache(maxsize=512)
+def _cached_validation_error(error_type: str, field_name, ctx_items: tuple) -> tuple[str, bytes]:
+    """
+    Mensagem e corpo JSON já serializado para um formato de erro repetido
+    (mesmo tipo, campo e contexto).
+    """
+    mensagem = _VALIDATION_MESSAGES[error_type](field_name, dict(ctx_items), "")
+    return mensagem, _error_body(mensagem)
+
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """
@@ -59,8 +130,12 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     - Tipos incorretos (string em vez de número)
     - Validações de range (gt, ge, lt, le)
     - Validações customizadas (@field_validator)
+    
+    Mantido async de propósito: o Starlette despacha handlers síncronos
+    para o threadpool, o que custaria mais do que a corrotina.
     """
     errors = exc.errors()
+    body = None
     
     if errors:
         first_error = errors[0]
@@ -77,61 +152,27 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         ctx = first_error.get('ctx', {})
         
         # ===== MENSAGENS CUSTOMIZADAS EM PORTUGUÊS =====
+        formatter = _VALIDATION_MESSAGES.get(error_type)
         
-        # Erros de valor (greater_than, less_than, etc)
-        if 'greater_than' in error_type:
-            if 'gt' in ctx:
-                mensagem = f"{field_name.replace('_', ' ').title()} deve ser maior que {ctx['gt']}"
-            else:
-                mensagem = f"{field_name.replace('_', ' ').title()} deve ser positivo"
-        
-        elif 'greater_than_equal' in error_type:
-            if 'ge' in ctx:
-                mensagem = f"{field_name.replace('_', ' ').title()} deve ser maior ou igual a {ctx['ge']}"
-            else:
-                mensagem = f"{field_name.replace('_', ' ').title()} não pode ser negativo"
-        
-        elif 'less_than_equal' in error_type:
-            mensagem = f"{field_name.replace('_', ' ').title()} excede o valor máximo permitido"
-        
-        # Erros de tipo
-        elif 'string_type' in error_type:
-            mensagem = f"{field_name.replace('_', ' ').title()} deve ser texto"
-        
-        elif 'int_type' in error_type or 'integer_type' in error_type:
-            mensagem = f"{field_name.replace('_', ' ').title()} deve ser um número inteiro"
-        
-        elif 'float_type' in error_type or 'decimal_type' in error_type:
-            mensagem = f"{field_name.replace('_', ' ').title()} deve ser um número"
-        
-        elif 'bool_type' in error_type:
-            mensagem = f"{field_name.replace('_', ' ').title()} deve ser verdadeiro ou falso"
-        
-        # Erros de obrigatoriedade
-        elif 'missing' in error_type:
-            mensagem = f"Campo obrigatório: {field_name.replace('_', ' ')}"
-        
-        # Erros de string (tamanho)
-        elif 'string_too_short' in error_type:
-            min_length = ctx.get('min_length', 1)
-            mensagem = f"{field_name.replace('_', ' ').title()} deve ter no mínimo {min_length} caracteres"
-        
-        elif 'string_too_long' in error_type:
-            max_length = ctx.get('max_length', 255)
-            mensagem = f"{field_name.replace('_', ' ').title()} deve ter no máximo {max_length} caracteres"
+        if formatter is not None and error_type not in _UNCACHED_VALIDATION_TYPES:
+            try:
+                mensagem, body = _cached_validation_error(
+                    error_type, field_name, tuple(ctx.items())
+                )
+            except TypeError:
+                # Contexto com valores não hasheáveis: formata sem cache
+                mensagem = formatter(field_name, ctx, error_msg)
         
-        # Erros de validação customizada (ValueError dos @field_validator)
-        elif 'value_error' in error_type:
-            # Pegar mensagem customizada do ValueError
-            mensagem = error_msg if error_msg else f"Erro de validação no campo {field_name}"
+        elif formatter is not None:
+            mensagem = formatter(field_name, ctx, error_msg)
         
         # Erros de parsing do body
-        elif 'json_invalid' in error_type or 'parsing' in error_msg.lower():
-            mensagem = "Formato JSON inválido. Verifique a sintaxe dos dados enviados"
+        elif 'parsing' in error_msg.lower():
+            mensagem = _INVALID_JSON_MESSAGE
         
         # Outros erros genéricos
         else:
-            mensagem = f"Erro de validação no campo {field_name.replace('_', ' ')}: {error_msg}"
+            mensagem = f"Erro de validação no campo {str(field_name).replace('_', ' ')}: {error_msg}"
     
     else:
         mensagem = "Erro de validação nos dados enviados"
@@ -145,14 +186,11 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         error_details=errors[0] if errors else None
     )
     
-    # Retornar envelope padrão de erro (DICT, não objeto)
-    return JSONResponse(
+    # Retornar envelope padrão de erro (corpo reaproveitado do cache quando possível)
+    return Response(
+        content=body if body is not None else _error_body(mensagem),
         status_code=400,
-        content={
-            "cod_retorno": 1,
-            "mensagem": mensagem,
-            "data": None
-        }
+        media_type="application/json"
     )
 
 
@@ -175,16 +213,13 @@ async def startup_event():
         app_name=settings.APP_NAME,
         version=settings.APP_VERSION,
         environment=settings.ENVIRONMENT,
-        debug=settings.DEBUG
+        debug=settings.DEBUG,
+        database_pool=engine.pool.status()
     )
-    print(f"🚀 {settings.APP_NAME} v{settings.APP_VERSION} iniciando...")
-    print(f"📊 Ambiente: {settings.ENVIRONMENT}")
-    print(f"🐛 Debug: {settings.DEBUG}")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Evento executado ao desligar a aplicação."""
     # ← ✨ MODIFICADO! Usar logger estruturado
-    logger.info("app_shutdown")
-    print("👋 Encerrando aplicação...")
\ No newline at end of file
+    logger.info("app_shutdown")
\ No newline at end of file
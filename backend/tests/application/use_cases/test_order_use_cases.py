@@ -3,6 +3,7 @@ Testes unitários para OrderUseCases.
 Valida as regras de negócio MAIS CRÍTICAS do sistema.
 """
 
+import re
 import pytest
 from decimal import Decimal
 from unittest.mock import MagicMock, call
@@ -18,6 +19,29 @@ from src.domain.exceptions.business_exceptions import (
 from src.core.constants import OrderStatus
 
 
+# Padrões de mensagens de erro (compilados uma vez na importação)
+_CUSTOMER_NOT_FOUND = re.compile(r"Cliente com ID 1 não encontrado")
+_PRODUCT_NOT_FOUND = re.compile(r"Produto com ID 1 não encontrado")
+_INACTIVE = re.compile(r"está inativo")
+_INSUFFICIENT_STOCK = re.compile(r"Estoque insuficiente")
+
+
+@pytest.fixture
+def use_case(
+    mock_order_repository,
+    mock_product_repository,
+    mock_customer_repository,
+    mock_db_session
+):
+    """Cria instância do OrderUseCases com mocks (compartilhada pelas classes do módulo)."""
+    return OrderUseCases(
+        order_repository=mock_order_repository,
+        product_repository=mock_product_repository,
+        customer_repository=mock_customer_repository,
+        db=mock_db_session
+    )
+
+
 class TestOrderUseCases:
     """Testes dos Use Cases de Order."""
     
@@ -25,25 +49,13 @@ class TestOrderUseCases:
     # FIXTURES LOCAIS
     # ==========================================
     
-    @pytest.fixture
-    def use_case(
-        self,
-        mock_order_repository,
-        mock_product_repository,
-        mock_customer_repository,
-        mock_db_session
-    ):
-        """Cria instância do OrderUseCases com mocks."""
-        return OrderUseCases(
-            order_repository=mock_order_repository,
-            product_repository=mock_product_repository,
-            customer_repository=mock_customer_repository,
-            db=mock_db_session
-        )
-    
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def valid_order_data(self):
-        """Dados válidos para criar pedido."""
+        """
+        Dados válidos para criar pedido.
+        Validado uma única vez e compartilhado: nenhum teste altera o payload
+        (quem precisar alterar deve usar copy.deepcopy).
+        """
         return OrderCreate(
             customer_id=1,
             items=[
@@ -52,12 +64,10 @@ class TestOrderUseCases:
             ]
         )
     
-    # ==========================================
-    # TESTES BÁSICOS
-    # ==========================================
-    
-    def test_create_order_sucesso(
+    @pytest.fixture
+    def create_order_scenario(
         self,
+        request,
         use_case,
         valid_order_data,
         customer_factory,
@@ -65,184 +75,120 @@ class TestOrderUseCases:
         order_factory,
         mock_customer_repository,
         mock_product_repository,
-        mock_order_repository,
-        mock_db_session
+        mock_order_repository
     ):
-        """Deve criar pedido válido com sucesso."""
-        # Arrange
-        idempotency_key = "test-key-123"
+        """
+        Configura os mocks do create_order a partir das flags do cenário
+        (customer_ok, product_ok, product_active, stock_ok).
+        
+        Retorna (use_case, order_data, idempotency_key, erro_esperado), onde
+        erro_esperado é None (caminho feliz) ou (exceção, padrão da mensagem).
+        """
+        scenario = request.param
+        idempotency_key = f"test-{request.node.callspec.id}"
         
         # Mock: Não existe pedido com essa key
         mock_order_repository.get_by_idempotency_key.return_value = None
         
-        # Mock: Cliente existe e está ativo
-        customer = customer_factory(id=1, is_active=True)
-        mock_customer_repository.get_by_id.return_value = customer
+        # Mock: Cliente
+        if scenario["customer_ok"]:
+            mock_customer_repository.get_by_id.return_value = customer_factory(id=1, is_active=True)
+        else:
+            mock_customer_repository.get_by_id.return_value = None
         
-        # Mock: Produtos existem e têm estoque
-        product1 = product_factory(id=1, price=Decimal("10.00"), stock_qty=100, is_active=True)
+        # Mock: Produtos (o pedido quer 2 unidades do produto 1 e 3 do produto 2)
+        product1 = product_factory(
+            id=1,
+            price=Decimal("10.00"),
+            stock_qty=100 if scenario["stock_ok"] else 1,
+            is_active=scenario["product_active"]
+        )
         product2 = product_factory(id=2, price=Decimal("15.00"), stock_qty=50, is_active=True)
-        mock_product_repository.get_by_id.side_effect = [product1, product2, product1, product2]
+        if scenario["product_ok"]:
+            mock_product_repository.get_by_id.side_effect = lambda pid: {1: product1, 2: product2}[pid]
+        else:
+            mock_product_repository.get_by_id.return_value = None
         
         # Mock: Pedido criado
-        created_order = order_factory(
+        mock_order_repository.create.return_value = order_factory(
             id=1,
             customer_id=1,
             total_amount=Decimal("65.00"),
             idempotency_key=idempotency_key
         )
-        mock_order_repository.create.return_value = created_order
-        
-        # Act
-        result = use_case.create_order(valid_order_data, idempotency_key)
-        
-        # Assert
-        assert result.id == 1
-        assert result.customer_id == 1
-        assert result.total_amount == 65.00
-        assert result.idempotency_key == idempotency_key
-        
-        # Verificar se commit foi chamado
-        mock_db_session.commit.assert_called_once()
         
-        # Verificar se create foi chamado
-        mock_order_repository.create.assert_called_once()
-        
-        # Verificar se estoque foi atualizado (2 produtos)
-        assert mock_product_repository.update.call_count == 2
-    
-    def test_create_order_cliente_nao_encontrado(
-        self,
-        use_case,
-        valid_order_data,
-        mock_customer_repository,
-        mock_order_repository,
-        mock_db_session
-    ):
-        """Deve lançar exceção se cliente não existir."""
-        # Arrange
-        idempotency_key = "test-key-456"
-        
-        # Mock: Não existe pedido com essa key
-        mock_order_repository.get_by_idempotency_key.return_value = None
-        
-        # Mock: Cliente NÃO existe
-        mock_customer_repository.get_by_id.return_value = None
-        
-        # Act & Assert
-        with pytest.raises(CustomerNotFoundException, match="Cliente com ID 1 não encontrado"):
-            use_case.create_order(valid_order_data, idempotency_key)
-        
-        # Verificar rollback
-        mock_db_session.rollback.assert_called_once()
-    
-    def test_create_order_produto_nao_encontrado(
-        self,
-        use_case,
-        valid_order_data,
-        customer_factory,
-        mock_customer_repository,
-        mock_product_repository,
-        mock_order_repository,
-        mock_db_session
-    ):
-        """Deve lançar exceção se produto não existir."""
-        # Arrange
-        idempotency_key = "test-key-789"
-        
-        # Mock: Não existe pedido com essa key
-        mock_order_repository.get_by_idempotency_key.return_value = None
-        
-        # Mock: Cliente existe
-        customer = customer_factory(id=1, is_active=True)
-        mock_customer_repository.get_by_id.return_value = customer
-        
-        # Mock: Produto NÃO existe
-        mock_product_repository.get_by_id.return_value = None
-        
-        # Act & Assert
-        with pytest.raises(ProductNotFoundException, match="Produto com ID 1 não encontrado"):
-            use_case.create_order(valid_order_data, idempotency_key)
-        
-        # Verificar rollback
-        mock_db_session.rollback.assert_called_once()
+        if not scenario["customer_ok"]:
+            expected = (CustomerNotFoundException, _CUSTOMER_NOT_FOUND)
+        elif not scenario["product_ok"]:
+            expected = (ProductNotFoundException, _PRODUCT_NOT_FOUND)
+        elif not scenario["product_active"]:
+            expected = (ValueError, _INACTIVE)
+        elif not scenario["stock_ok"]:
+            expected = (InsufficientStockException, _INSUFFICIENT_STOCK)
+        else:
+            expected = None
+        
+        return use_case, valid_order_data, idempotency_key, expected
     
     # ==========================================
-    # TESTES DE VALIDAÇÕES
+    # TESTES BÁSICOS E VALIDAÇÕES
     # ==========================================
     
-    def test_create_order_produto_inativo(
-        self,
-        use_case,
-        valid_order_data,
-        customer_factory,
-        product_factory,
-        mock_customer_repository,
-        mock_product_repository,
-        mock_order_repository,
-        mock_db_session
-    ):
-        """Deve rejeitar pedido com produto inativo."""
-        # Arrange
-        idempotency_key = "test-inactive"
-        
-        # Mock: Não existe pedido com essa key
-        mock_order_repository.get_by_idempotency_key.return_value = None
-        
-        # Mock: Cliente existe
-        customer = customer_factory(id=1, is_active=True)
-        mock_customer_repository.get_by_id.return_value = customer
-        
-        # Mock: Produto existe mas está INATIVO
-        product1 = product_factory(id=1, is_active=False)
-        mock_product_repository.get_by_id.return_value = product1
-        
-        # Act & Assert
-        with pytest.raises(ValueError, match="está inativo"):
-            use_case.create_order(valid_order_data, idempotency_key)
-        
-        # Verificar rollback
-        mock_db_session.rollback.assert_called_once()
-    
-    def test_create_order_estoque_insuficiente(
+    @pytest.mark.parametrize("create_order_scenario", [
+        pytest.param(
+            dict(customer_ok=True, product_ok=True, product_active=True, stock_ok=True),
+            id="sucesso"
+        ),
+        pytest.param(
+            dict(customer_ok=False, product_ok=True, product_active=True, stock_ok=True),
+            id="cliente_nao_encontrado"
+        ),
+        pytest.param(
+            dict(customer_ok=True, product_ok=False, product_active=True, stock_ok=True),
+            id="produto_nao_encontrado"
+        ),
+        pytest.param(
+            dict(customer_ok=True, product_ok=True, product_active=False, stock_ok=True),
+            id="produto_inativo"
+        ),
+        pytest.param(
+            dict(customer_ok=True, product_ok=True, product_active=True, stock_ok=False),
+            id="estoque_insuficiente"
+        ),
+    ], indirect=True)
+    def test_create_order(
         self,
-        use_case,
-        valid_order_data,
-        customer_factory,
-        product_factory,
-        mock_customer_repository,
+        create_order_scenario,
         mock_product_repository,
         mock_order_repository,
         mock_db_session
     ):
-        """Deve rejeitar pedido se estoque insuficiente."""
-        # Arrange
-        idempotency_key = "test-stock"
-        
-        # Mock: Não existe pedido com essa key
-        mock_order_repository.get_by_idempotency_key.return_value = None
-        
-        # Mock: Cliente existe
-        customer = customer_factory(id=1, is_active=True)
-        mock_customer_repository.get_by_id.return_value = customer
+        """Deve criar pedido válido ou rejeitar (com rollback) os cenários inválidos."""
+        use_case, order_data, idempotency_key, expected = create_order_scenario
+        
+        if expected is not None:
+            exc, pattern = expected
+            with pytest.raises(exc, match=pattern):
+                use_case.create_order(order_data, idempotency_key)
+            
+            # Verificar rollback e que nada foi criado
+            mock_db_session.rollback.assert_called_once()
+            mock_order_repository.create.assert_not_called()
+            return
         
-        # Mock: Produto existe mas com ESTOQUE INSUFICIENTE
-        product1 = product_factory(
-            id=1,
-            name="Produto Teste",
-            stock_qty=1,  # Só tem 1 unidade
-            is_active=True
-        )
-        mock_product_repository.get_by_id.return_value = product1
-        
-        # Pedido quer 2 unidades (valid_order_data.items[0].quantity = 2)
+        # Act
+        result = use_case.create_order(order_data, idempotency_key)
         
-        # Act & Assert
-        with pytest.raises(InsufficientStockException, match="Estoque insuficiente"):
-            use_case.create_order(valid_order_data, idempotency_key)
+        # Assert
+        assert result.id == 1
+        assert result.customer_id == 1
+        assert result.total_amount == 65.00
+        assert result.idempotency_key == idempotency_key
         
-        # Verificar rollback
-        mock_db_session.rollback.assert_called_once()
+        # Verificar commit, create e baixa de estoque (2 produtos)
+        mock_db_session.commit.assert_called_once()
+        mock_order_repository.create.assert_called_once()
+        assert mock_product_repository.update.call_count == 2
     
     # ==========================================
     # 🔥 TESTES CRÍTICOS - IDEMPOTÊNCIA
@@ -323,6 +269,32 @@ class TestOrderUseCases:
         # NÃO deve ter criado pedido B
         mock_order_repository.create.assert_not_called()
     
+    def test_create_order_idempotencia_concorrente(
+        self,
+        use_case,
+        valid_order_data,
+        order_factory,
+        mock_order_repository
+    ):
+        """
+        CRÍTICO: Se outra requisição criou o pedido enquanto esta aguardava
+        o lock da key, deve retornar o pedido já criado.
+        """
+        # Arrange
+        idempotency_key = "idem-race"
+        existing_order = order_factory(id=222, idempotency_key=idempotency_key)
+        
+        # 1ª busca (antes do lock) não encontra; 2ª (após o lock) encontra
+        mock_order_repository.get_by_idempotency_key.side_effect = [None, existing_order]
+        
+        # Act
+        result = use_case.create_order(valid_order_data, idempotency_key)
+        
+        # Assert
+        assert result.id == 222
+        mock_order_repository.lock_idempotency_key.assert_called_once_with(idempotency_key)
+        mock_order_repository.create.assert_not_called()
+    
     # ==========================================
     # 🔥 TESTES CRÍTICOS - TRANSAÇÃO ATÔMICA
     # ==========================================
@@ -365,7 +337,7 @@ class TestOrderUseCases:
         # Mock: Produto 2 INSUFICIENTE (só 3 unidades, pedido quer 10)
         product2 = product_factory(id=2, stock_qty=3, is_active=True, name="Produto 2")
         
-        mock_product_repository.get_by_id.side_effect = [product1, product2]
+        mock_product_repository.get_by_id.side_effect = lambda pid: {1: product1, 2: product2}[pid]
         
         # Act & Assert
         with pytest.raises(InsufficientStockException):
@@ -408,10 +380,8 @@ class TestOrderUseCases:
         # Mock: Produtos com estoque
         product1 = product_factory(id=1, stock_qty=100, is_active=True)
         product2 = product_factory(id=2, stock_qty=50, is_active=True)
-        mock_product_repository.get_by_id.side_effect = [
-            product1, product2,  # Primeira passada (validação)
-            product1, product2   # Segunda passada (atualização)
-        ]
+        # Cada produto é buscado uma única vez (validação e baixa de estoque)
+        mock_product_repository.get_by_id.side_effect = lambda pid: {1: product1, 2: product2}[pid]
         
         # Mock: Pedido criado
         created_order = order_factory(id=1, idempotency_key=idempotency_key)
@@ -428,6 +398,9 @@ class TestOrderUseCases:
         
         # Assert: Update foi chamado 2x (1 para cada produto)
         assert mock_product_repository.update.call_count == 2
+        
+        # Assert: Cada produto foi buscado uma única vez
+        assert mock_product_repository.get_by_id.call_count == 2
     
     def test_create_order_calcula_totais_corretamente(
         self,
@@ -462,7 +435,7 @@ class TestOrderUseCases:
         # Mock: Produtos com preços
         product1 = product_factory(id=1, price=Decimal("10.00"), stock_qty=100, is_active=True)
         product2 = product_factory(id=2, price=Decimal("15.00"), stock_qty=50, is_active=True)
-        mock_product_repository.get_by_id.side_effect = [product1, product2, product1, product2]
+        mock_product_repository.get_by_id.side_effect = lambda pid: {1: product1, 2: product2}[pid]
         
         # Mock: Capturar pedido criado
         created_order = None
@@ -518,8 +491,9 @@ class TestOrderUseCases:
         page = 2
         page_size = 10
         
-        # Mock: 25 pedidos no total
-        orders = [order_factory(id=i) for i in range(1, 11)]
+        # Mock: 25 pedidos no total (a página só é repassada, basta um pedido repetido)
+        sentinel = order_factory(id=1)
+        orders = [sentinel] * 10
         total = 25
         mock_order_repository.list_all.return_value = (orders, total)
         
@@ -560,25 +534,16 @@ class TestCancelOrder:
     
     def test_cancel_order_success(
         self,
+        use_case,
         order_factory,
-        mock_order_repository,
-        mock_product_repository,
-        mock_customer_repository,
-        mock_db_session
+        mock_order_repository
     ):
         """Deve cancelar pedido com sucesso."""
         order = order_factory(status=OrderStatus.CREATED.value)
         mock_order_repository.get_by_id.return_value = order
         mock_order_repository.update.return_value = order
         
-        use_cases = OrderUseCases(
-            order_repository=mock_order_repository,
-            product_repository=mock_product_repository,
-            customer_repository=mock_customer_repository,
-            db=mock_db_session
-        )
-        
-        result = use_cases.cancel_order(order.id)
+        result = use_case.cancel_order(order.id)
         
         assert result.status == OrderStatus.CANCELLED.value
         mock_order_repository.get_by_id.assert_called_once_with(order.id)
@@ -586,71 +551,64 @@ class TestCancelOrder:
     
     def test_cancel_order_not_found(
         self,
-        mock_order_repository,
-        mock_product_repository,
-        mock_customer_repository,
-        mock_db_session
+        use_case,
+        mock_order_repository
     ):
         """Deve lançar exceção quando pedido não existe."""
         mock_order_repository.get_by_id.return_value = None
         
-        use_cases = OrderUseCases(
-            order_repository=mock_order_repository,
-            product_repository=mock_product_repository,
-            customer_repository=mock_customer_repository,
-            db=mock_db_session
-        )
-        
         with pytest.raises(OrderNotFoundException):
-            use_cases.cancel_order(999)
+            use_case.cancel_order(999)
     
-    def test_cancel_order_when_paid_raises_exception(
+    @pytest.mark.parametrize("status", [
+        OrderStatus.PAID.value,
+        OrderStatus.CANCELLED.value,
+    ])
+    def test_cancel_order_status_invalido_raises_exception(
         self,
+        use_case,
         order_factory,
         mock_order_repository,
-        mock_product_repository,
-        mock_customer_repository,
-        mock_db_session
+        status
     ):
-        """Deve lançar exceção ao tentar cancelar pedido pago."""
-        order = order_factory(status=OrderStatus.PAID.value)
+        """Deve lançar exceção ao tentar cancelar pedido pago ou já cancelado."""
+        order = order_factory(status=status)
         mock_order_repository.get_by_id.return_value = order
         
-        use_cases = OrderUseCases(
-            order_repository=mock_order_repository,
-            product_repository=mock_product_repository,
-            customer_repository=mock_customer_repository,
-            db=mock_db_session
-        )
-        
         with pytest.raises(OrderCannotBeCancelledException):
-            use_cases.cancel_order(order.id)
+            use_case.cancel_order(order.id)
+        mock_order_repository.update.assert_not_called()
 
 
 class TestMarkAsPaid:
     """Testes para marcar pedido como pago."""
     
+    @pytest.fixture
+    def paid_flow(self, use_case, mock_order_repository, order_factory):
+        """
+        Prepara um pedido no status informado como retorno do get_by_id.
+        
+        Uso:
+            order, uc = paid_flow(OrderStatus.PAID.value)
+        """
+        def _go(status: str):
+            order = order_factory(status=status)
+            mock_order_repository.get_by_id.return_value = order
+            return order, use_case
+        return _go
+    
     def test_mark_as_paid_success(
         self,
+        use_case,
         order_factory,
-        mock_order_repository,
-        mock_product_repository,
-        mock_customer_repository,
-        mock_db_session
+        mock_order_repository
     ):
         """Deve marcar pedido como pago com sucesso."""
         order = order_factory(status=OrderStatus.CREATED.value)
         mock_order_repository.get_by_id.return_value = order
         mock_order_repository.update.return_value = order
         
-        use_cases = OrderUseCases(
-            order_repository=mock_order_repository,
-            product_repository=mock_product_repository,
-            customer_repository=mock_customer_repository,
-            db=mock_db_session
-        )
-        
-        result = use_cases.mark_as_paid(order.id)
+        result = use_case.mark_as_paid(order.id)
         
         assert result.status == OrderStatus.PAID.value
         mock_order_repository.get_by_id.assert_called_once_with(order.id)
@@ -658,64 +616,28 @@ class TestMarkAsPaid:
     
     def test_mark_as_paid_not_found(
         self,
-        mock_order_repository,
-        mock_product_repository,
-        mock_customer_repository,
-        mock_db_session
+        use_case,
+        mock_order_repository
     ):
         """Deve lançar exceção quando pedido não existe."""
         mock_order_repository.get_by_id.return_value = None
         
-        use_cases = OrderUseCases(
-            order_repository=mock_order_repository,
-            product_repository=mock_product_repository,
-            customer_repository=mock_customer_repository,
-            db=mock_db_session
-        )
-        
         with pytest.raises(OrderNotFoundException):
-            use_cases.mark_as_paid(999)
+            use_case.mark_as_paid(999)
     
-    def test_mark_as_paid_when_cancelled_raises_exception(
+    @pytest.mark.parametrize("status", [
+        OrderStatus.CANCELLED.value,
+        OrderStatus.PAID.value,
+    ])
+    def test_mark_as_paid_status_invalido_raises_exception(
         self,
-        order_factory,
+        paid_flow,
         mock_order_repository,
-        mock_product_repository,
-        mock_customer_repository,
-        mock_db_session
+        status
     ):
-        """Deve lançar exceção ao tentar marcar como pago pedido cancelado."""
-        order = order_factory(status=OrderStatus.CANCELLED.value)
-        mock_order_repository.get_by_id.return_value = order
-        
-        use_cases = OrderUseCases(
-            order_repository=mock_order_repository,
-            product_repository=mock_product_repository,
-            customer_repository=mock_customer_repository,
-            db=mock_db_session
-        )
-        
-        with pytest.raises(OrderCannotBePaidException):
-            use_cases.mark_as_paid(order.id)
-    
-    def test_mark_as_paid_when_already_paid_raises_exception(
-        self,
-        order_factory,
-        mock_order_repository,
-        mock_product_repository,
-        mock_customer_repository,
-        mock_db_session
-    ):
-        """Deve lançar exceção ao tentar marcar como pago pedido já pago."""
-        order = order_factory(status=OrderStatus.PAID.value)
-        mock_order_repository.get_by_id.return_value = order
-        
-        use_cases = OrderUseCases(
-            order_repository=mock_order_repository,
-            product_repository=mock_product_repository,
-            customer_repository=mock_customer_repository,
-            db=mock_db_session
-        )
+        """Deve lançar exceção ao tentar marcar como pago pedido cancelado ou já pago."""
+        order, uc = paid_flow(status)
         
         with pytest.raises(OrderCannotBePaidException):
-            use_cases.mark_as_paid(order.id)
\ No newline at end of file
+            uc.mark_as_paid(order.id)
+        mock_order_repository.update.assert_not_called()
@@ -21,11 +21,20 @@ from src.application.interfaces.repositories import (
 from src.core.constants import OrderStatus
 
 
+# Timestamp fixo para as factories (determinístico, sem ler o relógio)
+_FIXED_NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+# Valores Decimal padrão das factories (Decimal é imutável, pode ser compartilhado)
+_TEN = Decimal("10.00")
+_TWENTY = Decimal("20.00")
+
+
 # ==========================================
 # FACTORIES DE ENTITIES
 # ==========================================
+# Factories sem estado: escopo de sessão (cada chamada cria entidades novas)
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def product_factory():
     """
     Factory para criar ProductEntity de teste.
@@ -38,7 +47,7 @@ def product_factory():
         id: int = 1,
         name: str = "Produto Teste",
         sku: str = "TEST-001",
-        price: Decimal = Decimal("10.00"),
+        price: Decimal = _TEN,
         stock_qty: int = 100,
         is_active: bool = True
     ) -> ProductEntity:
@@ -49,13 +58,13 @@ def product_factory():
             price=price,
             stock_qty=stock_qty,
             is_active=is_active,
-            created_at=datetime.now(),
+            created_at=_FIXED_NOW,
             updated_at=None
         )
     return _create_product
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def customer_factory():
     """
     Factory para criar CustomerEntity de teste.
@@ -77,13 +86,13 @@ def customer_factory():
             email=email,
             document=document,
             is_active=is_active,
-            created_at=datetime.now(),
+            created_at=_FIXED_NOW,
             updated_at=None
         )
     return _create_customer
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def order_item_factory():
     """
     Factory para criar OrderItemEntity de teste.
@@ -96,12 +105,12 @@ def order_item_factory():
         id: int = 1,
         order_id: int = 1,
         product_id: int = 1,
-        unit_price: Decimal = Decimal("10.00"),
+        unit_price: Decimal = _TEN,
         quantity: int = 2,
         line_total: Decimal = None
     ) -> OrderItemEntity:
         if line_total is None:
-            line_total = unit_price * Decimal(quantity)
+            line_total = unit_price * quantity
         
         return OrderItemEntity(
             id=id,
@@ -114,7 +123,7 @@ def order_item_factory():
     return _create_order_item
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def order_factory(order_item_factory):
     """
     Factory para criar OrderEntity de teste.
@@ -126,7 +135,7 @@ def order_factory(order_item_factory):
     def _create_order(
         id: int = 1,
         customer_id: int = 1,
-        total_amount: Decimal = Decimal("20.00"),
+        total_amount: Decimal = _TWENTY,
         status: str = OrderStatus.CREATED.value,
         idempotency_key: str = "test-key-123",
         items: List[OrderItemEntity] = None
@@ -144,7 +153,7 @@ def order_factory(order_item_factory):
             total_amount=total_amount,
             status=status,
             idempotency_key=idempotency_key,
-            created_at=datetime.now(),
+            created_at=_FIXED_NOW,
             updated_at=None,
             items=items
         )
@@ -154,9 +163,54 @@ def order_factory(order_item_factory):
 # ==========================================
 # MOCKS DE REPOSITORIES
 # ==========================================
+# Os mocks com spec são criados uma única vez por sessão (a introspecção do
+# spec é cara) e zerados com reset_mock antes de cada teste.
+
+def _reset(mock):
+    """Zera chamadas, return_value e side_effect do mock (e dos filhos)."""
+    mock.reset_mock(return_value=True, side_effect=True)
+    return mock
+
+
+@pytest.fixture(scope="session")
+def _product_repo_template():
+    return MagicMock(spec=IProductRepository)
+
+
+@pytest.fixture(scope="session")
+def _customer_repo_template():
+    return MagicMock(spec=ICustomerRepository)
+
+
+@pytest.fixture(scope="session")
+def _order_repo_template():
+    return MagicMock(spec=IOrderRepository)
+
+
+class _DBStub:
+    """
+    Sessão fake com apenas os métodos usados pelos use cases.
+    Usa Mock simples (sem a configuração de dunders do MagicMock).
+    """
+
+    def __init__(self):
+        self.commit = Mock()
+        self.rollback = Mock()
+        self.flush = Mock()
+        self.refresh = Mock()
+
+    def reset_mock(self, **kwargs) -> None:
+        for method in (self.commit, self.rollback, self.flush, self.refresh):
+            method.reset_mock(**kwargs)
+
+
+@pytest.fixture(scope="session")
+def _db_session_template():
+    return _DBStub()
+
 
 @pytest.fixture
-def mock_product_repository():
+def mock_product_repository(_product_repo_template):
     """
     Mock do IProductRepository.
     
@@ -164,12 +218,11 @@ def mock_product_repository():
         mock_repo = mock_product_repository
         mock_repo.get_by_id.return_value = product
     """
-    mock = MagicMock(spec=IProductRepository)
-    return mock
+    return _reset(_product_repo_template)
 
 
 @pytest.fixture
-def mock_customer_repository():
+def mock_customer_repository(_customer_repo_template):
     """
     Mock do ICustomerRepository.
     
@@ -177,12 +230,11 @@ def mock_customer_repository():
         mock_repo = mock_customer_repository
         mock_repo.get_by_id.return_value = customer
     """
-    mock = MagicMock(spec=ICustomerRepository)
-    return mock
+    return _reset(_customer_repo_template)
 
 
 @pytest.fixture
-def mock_order_repository():
+def mock_order_repository(_order_repo_template):
     """
     Mock do IOrderRepository.
     
@@ -190,12 +242,11 @@ def mock_order_repository():
         mock_repo = mock_order_repository
         mock_repo.create.return_value = order
     """
-    mock = MagicMock(spec=IOrderRepository)
-    return mock
+    return _reset(_order_repo_template)
 
 
 @pytest.fixture
-def mock_db_session():
+def mock_db_session(_db_session_template):
     """
     Mock da sessão do banco de dados.
     
@@ -203,9 +254,4 @@ def mock_db_session():
         mock_db = mock_db_session
         mock_db.commit.assert_called_once()
     """
-    mock = MagicMock()
-    mock.commit = MagicMock()
-    mock.rollback = MagicMock()
-    mock.flush = MagicMock()
-    mock.refresh = MagicMock()
-    return mock
\ No newline at end of file
+    return _reset(_db_session_template)
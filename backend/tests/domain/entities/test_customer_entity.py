@@ -3,10 +3,18 @@ Testes unitários para CustomerEntity.
 Valida regras de negócio relacionadas a clientes.
 """
 
+import re
 import pytest
+from types import SimpleNamespace
 from src.domain.entities.customer import CustomerEntity
 
 
+# Mensagens de erro esperadas (regex compiladas uma única vez)
+_NAME_REQUIRED = re.compile(r"Nome do cliente é obrigatório")
+_INVALID_EMAIL = re.compile(r"Email inválido")
+_INVALID_DOCUMENT = re.compile(r"Documento inválido")
+
+
 class TestCustomerEntity:
     """Testes da entidade CustomerEntity."""
     
@@ -25,56 +33,99 @@ class TestCustomerEntity:
         assert customer.document == "12345678900"
         assert customer.is_active is True
     
+    @pytest.mark.validation
     def test_validar_nome_obrigatorio(self, customer_factory):
         """Deve rejeitar cliente sem nome."""
         # Arrange
         customer = customer_factory(name="")
         
         # Act & Assert
-        with pytest.raises(ValueError, match="Nome do cliente é obrigatório"):
+        with pytest.raises(ValueError, match=_NAME_REQUIRED):
             customer.validate()
     
+    @pytest.mark.validation
     def test_validar_email_formato_invalido(self, customer_factory):
         """Deve rejeitar email com formato inválido."""
         # Arrange
         customer = customer_factory(email="email_invalido")
         
         # Act & Assert
-        with pytest.raises(ValueError, match="Email inválido"):
+        with pytest.raises(ValueError, match=_INVALID_EMAIL):
             customer.validate()
     
-    def test_validar_email_formato_valido(self):
+    @pytest.mark.parametrize("email", [
+        "teste@email.com",
+        "usuario.teste@empresa.com.br",
+        "user+tag@domain.co",
+    ])
+    def test_validar_email_formato_valido(self, email):
         """Deve aceitar emails com formato válido."""
         # Assert
-        assert CustomerEntity.is_valid_email("teste@email.com") is True
-        assert CustomerEntity.is_valid_email("usuario.teste@empresa.com.br") is True
-        assert CustomerEntity.is_valid_email("user+tag@domain.co") is True
+        assert CustomerEntity.is_valid_email(email) is True
+    
+    @pytest.mark.parametrize("email", [
+        "email_invalido",
+        "a@@b.co",
+        "a@b@c.co",
+        "@dominio.com",
+        "usuario@dominio",
+    ])
+    @pytest.mark.validation
+    def test_is_valid_email_rejeita_formatos_invalidos(self, email):
+        """Deve rejeitar emails malformados (inclusive pelo pré-filtro de '@')."""
+        # Assert
+        assert CustomerEntity.is_valid_email(email) is False
     
-    def test_validar_documento_cpf_valido(self):
-        """Deve aceitar CPF válido (11 dígitos)."""
+    def test_email_regex_compilada_na_classe(self):
+        """A regex de email deve ser compilada uma vez e reaproveitada."""
         # Assert
-        assert CustomerEntity.is_valid_document("12345678900") is True
-        assert CustomerEntity.is_valid_document("123.456.789-00") is True
+        assert isinstance(CustomerEntity._EMAIL_REGEX, re.Pattern)
     
-    def test_validar_documento_cnpj_valido(self):
-        """Deve aceitar CNPJ válido (14 dígitos)."""
+    @pytest.mark.parametrize("document,valid,formatted", [
+        ("12345678900", True, "12345678900"),           # CPF (11 dígitos)
+        ("123.456.789-00", True, "12345678900"),        # CPF formatado
+        ("12345678000190", True, "12345678000190"),     # CNPJ (14 dígitos)
+        ("12.345.678/0001-90", True, "12345678000190"), # CNPJ formatado
+        # Caminho de erro: só as linhas inválidas levam o marker validation
+        pytest.param("123", False, None, marks=pytest.mark.validation),  # Muito curto
+    ])
+    def test_validar_e_formatar_documento(self, document, valid, formatted):
+        """Deve aceitar CPF/CNPJ com ou sem máscara e formatar só com dígitos."""
         # Assert
-        assert CustomerEntity.is_valid_document("12345678000190") is True
-        assert CustomerEntity.is_valid_document("12.345.678/0001-90") is True
+        assert CustomerEntity.is_valid_document(document) is valid
+        if valid:
+            assert CustomerEntity.format_document(document) == formatted
     
+    @pytest.mark.validation
     def test_validar_documento_invalido(self, customer_factory):
         """Deve rejeitar documento com tamanho inválido."""
         # Arrange
         customer = customer_factory(document="123")  # Muito curto
         
         # Act & Assert
-        with pytest.raises(ValueError, match="Documento inválido"):
+        with pytest.raises(ValueError, match=_INVALID_DOCUMENT):
             customer.validate()
     
-    def test_format_document(self):
-        """Deve remover caracteres especiais do documento."""
+    def test_from_model_copia_atributos(self):
+        """Deve construir a entidade a partir de um model sem chamar __init__."""
+        # Arrange
+        model = SimpleNamespace(
+            id=7,
+            name="Maria",
+            email="maria@email.com",
+            document="12345678900",
+            is_active=False,
+            created_at=None,
+            updated_at=None
+        )
+        
         # Act
-        formatted = CustomerEntity.format_document("123.456.789-00")
+        customer = CustomerEntity.from_model(model)
         
         # Assert
-        assert formatted == "12345678900"
\ No newline at end of file
+        assert isinstance(customer, CustomerEntity)
+        assert customer.id == 7
+        assert customer.name == "Maria"
+        assert customer.email == "maria@email.com"
+        assert customer.document == "12345678900"
+        assert customer.is_active is False
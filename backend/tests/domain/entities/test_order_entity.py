@@ -3,101 +3,129 @@ Testes unitários para OrderEntity.
 Valida regras de negócio relacionadas a pedidos.
 """
 
+import re
 import pytest
 from decimal import Decimal
 from src.domain.entities.order import OrderEntity
 from src.core.constants import OrderStatus
 
 
+# Valores Decimal usados nos testes (parseados uma única vez)
+D0 = Decimal("0.00")
+D10 = Decimal("10.00")
+D15 = Decimal("15.00")
+D25 = Decimal("25.00")
+D50 = Decimal("50.00")
+D100 = Decimal("100.00")
+
+
+# Mensagens de erro esperadas (regex compiladas uma única vez)
+_INVALID_CUSTOMER = re.compile(r"ID do cliente deve ser maior que zero")
+_NEGATIVE_TOTAL = re.compile(r"Valor total não pode ser negativo")
+_INVALID_STATUS = re.compile(r"Status inválido")
+_NO_ITEMS = re.compile(r"Pedido deve conter ao menos um item")
+
+
 class TestOrderEntity:
     """Testes da entidade OrderEntity."""
     
+    @pytest.fixture(scope="class")
+    def created_order(self, order_factory):
+        """
+        Pedido CREATED compartilhado pela classe.
+        Apenas para testes que só leem o pedido (os que alteram status criam o seu).
+        """
+        return order_factory(status=OrderStatus.CREATED.value)
+    
     def test_criar_order_valido(self, order_factory):
         """Deve criar pedido válido com sucesso."""
         # Arrange & Act
         order = order_factory(
             customer_id=1,
-            total_amount=Decimal("100.00"),
+            total_amount=D100,
             status=OrderStatus.CREATED.value
         )
         
         # Assert
         assert order.customer_id == 1
-        assert order.total_amount == Decimal("100.00")
+        assert order.total_amount == D100
         assert order.status == OrderStatus.CREATED.value
         assert len(order.items) == 2  # Factory cria 2 itens padrão
     
+    @pytest.mark.validation
     def test_validar_customer_id_invalido(self, order_factory):
         """Deve rejeitar pedido com customer_id inválido."""
         # Arrange
         order = order_factory(customer_id=0)
         
         # Act & Assert
-        with pytest.raises(ValueError, match="ID do cliente deve ser maior que zero"):
+        with pytest.raises(ValueError, match=_INVALID_CUSTOMER):
             order.validate()
     
+    @pytest.mark.validation
     def test_validar_total_amount_negativo(self, order_factory):
         """Deve rejeitar pedido com total negativo."""
         # Arrange
         order = order_factory(total_amount=Decimal("-10.00"))
         
         # Act & Assert
-        with pytest.raises(ValueError, match="Valor total não pode ser negativo"):
+        with pytest.raises(ValueError, match=_NEGATIVE_TOTAL):
             order.validate()
     
+    @pytest.mark.validation
     def test_validar_status_invalido(self, order_factory):
         """Deve rejeitar pedido com status inválido."""
         # Arrange
         order = order_factory(status="STATUS_INVALIDO")
         
         # Act & Assert
-        with pytest.raises(ValueError, match="Status inválido"):
+        with pytest.raises(ValueError, match=_INVALID_STATUS):
             order.validate()
     
+    @pytest.mark.validation
     def test_validar_pedido_sem_itens(self, order_factory):
         """Deve rejeitar pedido sem itens."""
         # Arrange
         order = order_factory(items=[])
         
         # Act & Assert
-        with pytest.raises(ValueError, match="Pedido deve conter ao menos um item"):
+        with pytest.raises(ValueError, match=_NO_ITEMS):
             order.validate()
     
-    def test_calculate_total(self, order_factory, order_item_factory):
+    @pytest.mark.parametrize("rows,expected", [
+        ([(D10, 2), (D15, 3)], Decimal("65.00")),     # 20.00 + 45.00
+        ([(Decimal("1.00"), 1)], Decimal("1.00")),    # Item único
+        ([(Decimal("0.01"), 100)], Decimal("1.00")),  # Sem erro de arredondamento
+    ])
+    def test_calculate_total(self, order_factory, order_item_factory, rows, expected):
         """Deve calcular total do pedido corretamente."""
         # Arrange
-        items = [
-            order_item_factory(unit_price=Decimal("10.00"), quantity=2),  # 20.00
-            order_item_factory(unit_price=Decimal("15.00"), quantity=3)   # 45.00
-        ]
+        items = [order_item_factory(unit_price=price, quantity=qty) for price, qty in rows]
         order = order_factory(items=items)
         
         # Act
         total = order.calculate_total()
         
         # Assert
-        assert total == Decimal("65.00")
+        assert total == expected
     
     def test_add_item(self, order_factory, order_item_factory):
         """Deve adicionar item e recalcular total."""
         # Arrange
-        order = order_factory(items=[], total_amount=Decimal("0.00"))
-        new_item = order_item_factory(unit_price=Decimal("25.00"), quantity=2)
+        order = order_factory(items=[], total_amount=D0)
+        new_item = order_item_factory(unit_price=D25, quantity=2)
         
         # Act
         order.add_item(new_item)
         
         # Assert
         assert len(order.items) == 1
-        assert order.total_amount == Decimal("50.00")
+        assert order.total_amount == D50
     
-    def test_can_be_cancelled_status_created(self, order_factory):
+    def test_can_be_cancelled_status_created(self, created_order):
         """Deve permitir cancelamento de pedido CREATED."""
-        # Arrange
-        order = order_factory(status=OrderStatus.CREATED.value)
-        
         # Act
-        result = order.can_be_cancelled()
+        result = created_order.can_be_cancelled()
         
         # Assert
         assert result is True
@@ -3,11 +3,25 @@ Testes unitários para OrderItemEntity.
 Valida regras de negócio relacionadas a itens de pedidos.
 """
 
+import re
 import pytest
 from decimal import Decimal
 from src.domain.entities.order_item import OrderItemEntity
 
 
+# Valores Decimal usados nos testes (parseados uma única vez)
+D0 = Decimal("0.00")
+D10 = Decimal("10.00")
+D50 = Decimal("50.00")
+
+
+# Mensagens de erro esperadas (regex compiladas uma única vez)
+_INVALID_PRODUCT = re.compile(r"ID do produto deve ser maior que zero")
+_INVALID_UNIT_PRICE = re.compile(r"Preço unitário deve ser maior que zero")
+_INVALID_QUANTITY = re.compile(r"Quantidade deve ser maior que zero")
+_WRONG_LINE_TOTAL = re.compile(r"Total da linha incorreto")
+
+
 class TestOrderItemEntity:
     """Testes da entidade OrderItemEntity."""
     
@@ -16,13 +30,13 @@ class TestOrderItemEntity:
         # Arrange & Act
         item = order_item_factory(
             product_id=1,
-            unit_price=Decimal("10.00"),
+            unit_price=D10,
             quantity=3
         )
         
         # Assert
         assert item.product_id == 1
-        assert item.unit_price == Decimal("10.00")
+        assert item.unit_price == D10
         assert item.quantity == 3
         assert item.line_total == Decimal("30.00")
     
@@ -38,53 +52,34 @@ class TestOrderItemEntity:
         total = item.calculate_line_total()
         
         # Assert
-        assert total == Decimal("50.00")
+        assert total == D50
     
-    def test_validar_product_id_invalido(self, order_item_factory):
-        """Deve rejeitar item com product_id inválido."""
-        # Arrange
-        item = order_item_factory(product_id=0)
-        
-        # Act & Assert
-        with pytest.raises(ValueError, match="ID do produto deve ser maior que zero"):
-            item.validate()
+    @pytest.fixture
+    def base_item(self, order_item_factory):
+        """Item válido (10.00 x 2) a ser invalidado campo a campo."""
+        return order_item_factory()
     
-    def test_validar_unit_price_zero(self, order_item_factory):
-        """Deve rejeitar item com preço zero."""
+    @pytest.mark.validation
+    @pytest.mark.parametrize("field,value,msg", [
+        ("product_id", 0, _INVALID_PRODUCT),
+        ("unit_price", D0, _INVALID_UNIT_PRICE),
+        ("quantity", 0, _INVALID_QUANTITY),
+        ("line_total", Decimal("99.99"), _WRONG_LINE_TOTAL),  # Deveria ser 20.00
+    ])
+    def test_validar_item_invalido(self, base_item, field, value, msg):
+        """Deve rejeitar item com product_id, preço, quantidade ou line_total inválidos."""
         # Arrange
-        item = order_item_factory(unit_price=Decimal("0.00"))
-        
-        # Act & Assert
-        with pytest.raises(ValueError, match="Preço unitário deve ser maior que zero"):
-            item.validate()
-    
-    def test_validar_quantity_zero(self, order_item_factory):
-        """Deve rejeitar item com quantidade zero."""
-        # Arrange
-        item = order_item_factory(quantity=0)
-        
-        # Act & Assert
-        with pytest.raises(ValueError, match="Quantidade deve ser maior que zero"):
-            item.validate()
-    
-    def test_validar_line_total_incorreto(self, order_item_factory):
-        """Deve rejeitar item com line_total incorreto."""
-        # Arrange
-        item = order_item_factory(
-            unit_price=Decimal("10.00"),
-            quantity=3,
-            line_total=Decimal("99.99")  # Incorreto! Deveria ser 30.00
-        )
+        setattr(base_item, field, value)
         
         # Act & Assert
-        with pytest.raises(ValueError, match="Total da linha incorreto"):
-            item.validate()
+        with pytest.raises(ValueError, match=msg):
+            base_item.validate()
     
     def test_update_quantity(self, order_item_factory):
         """Deve atualizar quantidade e recalcular line_total."""
         # Arrange
         item = order_item_factory(
-            unit_price=Decimal("10.00"),
+            unit_price=D10,
             quantity=2
         )
         
@@ -93,4 +88,4 @@ class TestOrderItemEntity:
         
         # Assert
         assert item.quantity == 5
-        assert item.line_total == Decimal("50.00")
\ No newline at end of file
+        assert item.line_total == D50
\ No newline at end of file
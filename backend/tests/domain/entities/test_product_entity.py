@@ -3,11 +3,26 @@ Testes unitários para ProductEntity.
 Valida regras de negócio relacionadas a produtos.
 """
 
+import re
 import pytest
 from decimal import Decimal
 from src.domain.entities.product import ProductEntity
 
 
+# Valores Decimal usados nos testes (parseados uma única vez)
+D0 = Decimal("0.00")
+D15 = Decimal("15.00")
+
+
+# Mensagens de erro esperadas (regex compiladas uma única vez)
+_INVALID_PRICE = re.compile(r"Preço deve ser maior que zero")
+_NEGATIVE_STOCK = re.compile(r"Quantidade em estoque não pode ser negativa")
+_NAME_REQUIRED = re.compile(r"Nome do produto é obrigatório")
+_SKU_REQUIRED = re.compile(r"SKU é obrigatório")
+_INSUFFICIENT_STOCK = re.compile(r"Estoque insuficiente")
+_INVALID_QUANTITY = re.compile(r"Quantidade deve ser maior que zero")
+
+
 class TestProductEntity:
     """Testes da entidade ProductEntity."""
     
@@ -17,60 +32,56 @@ class TestProductEntity:
         product = product_factory(
             name="Paracetamol",
             sku="MED-001",
-            price=Decimal("15.00"),
+            price=D15,
             stock_qty=50
         )
         
         # Assert
         assert product.name == "Paracetamol"
         assert product.sku == "MED-001"
-        assert product.price == Decimal("15.00")
+        assert product.price == D15
         assert product.stock_qty == 50
         assert product.is_active is True
     
-    def test_validar_preco_positivo(self, product_factory):
+    @pytest.mark.parametrize("price", [Decimal("-10.00"), D0])
+    @pytest.mark.validation
+    def test_validar_preco_positivo(self, product_factory, price):
         """Deve rejeitar produto com preço negativo ou zero."""
         # Arrange
-        product = product_factory(price=Decimal("-10.00"))
-        
-        # Act & Assert
-        with pytest.raises(ValueError, match="Preço deve ser maior que zero"):
-            product.validate()
-    
-    def test_validar_preco_zero(self, product_factory):
-        """Deve rejeitar produto com preço zero."""
-        # Arrange
-        product = product_factory(price=Decimal("0.00"))
+        product = product_factory(price=price)
         
         # Act & Assert
-        with pytest.raises(ValueError, match="Preço deve ser maior que zero"):
+        with pytest.raises(ValueError, match=_INVALID_PRICE):
             product.validate()
     
+    @pytest.mark.validation
     def test_validar_estoque_nao_negativo(self, product_factory):
         """Deve rejeitar produto com estoque negativo."""
         # Arrange
         product = product_factory(stock_qty=-5)
         
         # Act & Assert
-        with pytest.raises(ValueError, match="Quantidade em estoque não pode ser negativa"):
+        with pytest.raises(ValueError, match=_NEGATIVE_STOCK):
             product.validate()
     
+    @pytest.mark.validation
     def test_validar_nome_obrigatorio(self, product_factory):
         """Deve rejeitar produto sem nome."""
         # Arrange
         product = product_factory(name="")
         
         # Act & Assert
-        with pytest.raises(ValueError, match="Nome do produto é obrigatório"):
+        with pytest.raises(ValueError, match=_NAME_REQUIRED):
             product.validate()
     
+    @pytest.mark.validation
     def test_validar_sku_obrigatorio(self, product_factory):
         """Deve rejeitar produto sem SKU."""
         # Arrange
         product = product_factory(sku="")
         
         # Act & Assert
-        with pytest.raises(ValueError, match="SKU é obrigatório"):
+        with pytest.raises(ValueError, match=_SKU_REQUIRED):
             product.validate()
     
     def test_has_sufficient_stock_com_estoque(self, product_factory):
@@ -123,7 +134,7 @@ class TestProductEntity:
         product = product_factory(stock_qty=3)
         
         # Act & Assert
-        with pytest.raises(ValueError, match="Estoque insuficiente"):
+        with pytest.raises(ValueError, match=_INSUFFICIENT_STOCK):
             product.decrease_stock(5)
     
     def test_increase_stock_sucesso(self, product_factory):
@@ -143,5 +154,5 @@ class TestProductEntity:
         product = product_factory(stock_qty=10)
         
         # Act & Assert
-        with pytest.raises(ValueError, match="Quantidade deve ser maior que zero"):
+        with pytest.raises(ValueError, match=_INVALID_QUANTITY):
             product.increase_stock(0)
\ No newline at end of file
@@ -0,0 +1,156 @@
+"""
+Testes unitários para InMemoryTTLCache.
+Valida expiração por TTL, descarte da entrada mais antiga e cópia dos valores.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from src.infrastructure.cache.memory_cache import InMemoryTTLCache
+
+
+# Relógio monotônico controlado pelos testes
+_MONOTONIC = "src.infrastructure.cache.memory_cache.time.monotonic"
+
+
+class TestInMemoryTTLCache:
+    """Testes do InMemoryTTLCache."""
+    
+    # ==========================================
+    # FIXTURES LOCAIS
+    # ==========================================
+    
+    @pytest.fixture
+    def clock(self):
+        """Patch de time.monotonic; ajuste clock.return_value para avançar o tempo."""
+        with patch(_MONOTONIC, return_value=1000.0) as mock_monotonic:
+            yield mock_monotonic
+    
+    @pytest.fixture
+    def cache(self):
+        """Cache pequeno para exercitar o descarte por maxsize."""
+        return InMemoryTTLCache(maxsize=2)
+    
+    # ==========================================
+    # TESTES DE EXPIRAÇÃO
+    # ==========================================
+    
+    def test_get_retorna_valor_antes_de_expirar(self, cache, clock):
+        """Deve devolver o valor enquanto o TTL não venceu."""
+        # Arrange
+        cache.setex("k", 60, "valor")
+        clock.return_value = 1059.9
+        
+        # Act & Assert
+        assert cache.get("k") == "valor"
+    
+    def test_get_expirado_retorna_none_e_remove(self, cache, clock):
+        """Deve devolver None e descartar a entrada quando o TTL vence."""
+        # Arrange
+        cache.setex("k", 60, "valor")
+        clock.return_value = 1060.0
+        
+        # Act
+        result = cache.get("k")
+        
+        # Assert
+        assert result is None
+        assert "k" not in cache._data
+    
+    def test_get_chave_ausente_retorna_none(self, cache):
+        """Deve devolver None para chave nunca armazenada."""
+        assert cache.get("inexistente") is None
+    
+    # ==========================================
+    # TESTES DE DESCARTE (MAXSIZE)
+    # ==========================================
+    
+    def test_setex_descarta_entrada_mais_antiga(self, cache, clock):
+        """Deve descartar a entrada mais antiga ao atingir maxsize."""
+        # Arrange
+        cache.setex("a", 60, 1)
+        cache.setex("b", 60, 2)
+        
+        # Act
+        cache.setex("c", 60, 3)
+        
+        # Assert
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert cache.get("c") == 3
+    
+    def test_setex_chave_existente_renova_posicao(self, cache, clock):
+        """Deve mover a chave regravada para o fim (não é mais a mais antiga)."""
+        # Arrange
+        cache.setex("a", 60, 1)
+        cache.setex("b", 60, 2)
+        cache.setex("a", 60, 10)  # "b" passa a ser a mais antiga
+        
+        # Act
+        cache.setex("c", 60, 3)
+        
+        # Assert
+        assert cache.get("a") == 10
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+    
+    def test_setex_chave_existente_renova_ttl(self, cache, clock):
+        """Deve recalcular a expiração ao regravar a chave."""
+        # Arrange
+        cache.setex("a", 60, 1)
+        clock.return_value = 1050.0
+        cache.setex("a", 60, 2)
+        
+        # Act
+        clock.return_value = 1100.0
+        
+        # Assert
+        assert cache.get("a") == 2
+    
+    # ==========================================
+    # TESTES DE CÓPIA
+    # ==========================================
+    
+    def test_get_retorna_copia(self, cache):
+        """Deve devolver uma cópia: alterar o retorno não altera o cache."""
+        # Arrange
+        cache.setex("k", 60, {"itens": [1, 2]})
+        
+        # Act
+        first = cache.get("k")
+        first["itens"].append(3)
+        
+        # Assert
+        assert cache.get("k") == {"itens": [1, 2]}
+        assert cache.get("k") is not cache.get("k")
+    
+    def test_setex_armazena_copia(self, cache):
+        """Deve copiar na escrita: alterar o objeto original não altera o cache."""
+        # Arrange
+        value = {"itens": [1, 2]}
+        cache.setex("k", 60, value)
+        
+        # Act
+        value["itens"].append(3)
+        
+        # Assert
+        assert cache.get("k") == {"itens": [1, 2]}
+    
+    # ==========================================
+    # TESTES DE REMOÇÃO
+    # ==========================================
+    
+    def test_delete_e_clear(self, cache):
+        """Deve remover uma chave com delete e todas com clear."""
+        # Arrange
+        cache.setex("a", 60, 1)
+        cache.setex("b", 60, 2)
+        
+        # Act & Assert
+        cache.delete("a")
+        cache.delete("inexistente")  # Não deve falhar
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        
+        cache.clear()
+        assert cache.get("b") is None
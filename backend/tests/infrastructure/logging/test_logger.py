@@ -0,0 +1,39 @@
+"""
+Testes unitários para a configuração de logs (renderer JSON com orjson).
+"""
+
+import orjson
+import structlog
+
+from src.infrastructure.logging.logger import _orjson_dumps
+
+
+class TestOrjsonDumps:
+    """Testes do serializador usado pelo JSONRenderer em produção."""
+    
+    def test_aceita_chaves_nao_str(self):
+        """Deve serializar dicts com chaves int (como o json da stdlib) em vez de falhar."""
+        # Act
+        result = _orjson_dumps({"event": "ev", "mapping": {1: "a"}})
+        
+        # Assert
+        assert result == '{"event":"ev","mapping":{"1":"a"}}'
+    
+    def test_combina_option_do_chamador(self):
+        """Deve manter a option recebida junto com OPT_NON_STR_KEYS."""
+        # Act
+        result = _orjson_dumps({"b": 1, 2: 3}, option=orjson.OPT_SORT_KEYS)
+        
+        # Assert
+        assert result == '{"2":3,"b":1}'
+    
+    def test_json_renderer_com_chaves_nao_str(self):
+        """Deve renderizar o evento pelo JSONRenderer sem propagar TypeError."""
+        # Arrange
+        renderer = structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+        
+        # Act
+        result = renderer(None, "info", {"event": "ev", "mapping": {1: "a"}})
+        
+        # Assert
+        assert orjson.loads(result) == {"event": "ev", "mapping": {"1": "a"}}
@@ -0,0 +1,23 @@
+"""
+Fixtures compartilhadas pelos testes de repositórios.
+"""
+
+import pytest
+from unittest.mock import MagicMock
+from sqlalchemy.orm import Session
+
+
+@pytest.fixture(scope="class")
+def mock_db_session():
+    """
+    Mock da sessão do banco de dados (atributos restritos aos da Session).
+    Criado uma vez por classe de teste e zerado antes de cada teste (_reset_db_session).
+    """
+    return MagicMock(spec=Session)
+
+
+@pytest.fixture(autouse=True)
+def _reset_db_session(mock_db_session):
+    """Zera chamadas, return_value e side_effect da sessão compartilhada."""
+    mock_db_session.reset_mock(return_value=True, side_effect=True)
+    yield
@@ -0,0 +1,112 @@
+"""
+Testes unitários para CustomerRepository.
+Valida a listagem por projeção (filtros, linhas em dict e total).
+"""
+
+import pytest
+from collections import namedtuple
+from datetime import datetime
+from unittest.mock import NonCallableMock
+
+from src.infrastructure.repositories.customer_repository import CustomerRepository
+from src.infrastructure.database.models import Customer
+
+
+# Linha projetada (Row do SQLAlchemy expõe _asdict, assim como a namedtuple)
+_CustomerRow = namedtuple(
+    "_CustomerRow",
+    ["id", "name", "email", "document", "is_active", "created_at", "updated_at"]
+)
+_ROWS = (
+    _CustomerRow(1, "Ana", "ana@email.com", "12345678900", True, datetime(2024, 1, 1), None),
+    _CustomerRow(2, "Bruno", "bruno@email.com", "98765432100", True, datetime(2024, 1, 2), None),
+)
+
+
+def _compile(expression) -> str:
+    """SQL do filtro com os valores embutidos (para comparar o padrão do ILIKE)."""
+    return str(expression.compile(compile_kwargs={"literal_binds": True}))
+
+
+class TestCustomerRepository:
+    """Testes do CustomerRepository."""
+    
+    # ==========================================
+    # FIXTURES LOCAIS
+    # ==========================================
+    
+    @pytest.fixture
+    def mock_query_chain(self, mock_db_session):
+        """
+        Query encadeável já ligada a db.query(...).with_entities(...).
+        filter/offset/limit devolvem a própria query; cada teste define
+        apenas o retorno de all/count.
+        """
+        mock_query = NonCallableMock(spec=["filter", "offset", "limit", "all", "count"])
+        for method in ("filter", "offset", "limit"):
+            getattr(mock_query, method).return_value = mock_query
+        mock_db_session.query.return_value.with_entities.return_value = mock_query
+        return mock_query
+    
+    @pytest.fixture
+    def repository(self, mock_db_session):
+        """Instância do CustomerRepository com mock."""
+        return CustomerRepository(mock_db_session)
+    
+    # ==========================================
+    # TESTES DE LISTAGEM (PROJEÇÃO)
+    # ==========================================
+    
+    def test_list_all_projection_retorna_dicts_e_total(
+        self,
+        repository,
+        mock_db_session,
+        mock_query_chain
+    ):
+        """Deve devolver as linhas como dicts (via _asdict) e o total da contagem."""
+        # Arrange
+        mock_query_chain.count.return_value = 42
+        mock_query_chain.all.return_value = list(_ROWS)
+        
+        # Act
+        customers, total = repository.list_all_projection(skip=20, limit=2)
+        
+        # Assert
+        assert customers == [row._asdict() for row in _ROWS]
+        assert all(type(c) is dict for c in customers)
+        assert total == 42
+        
+        # Apenas as colunas da listagem, sem filtros e com paginação
+        mock_db_session.query.assert_called_once_with(Customer)
+        mock_db_session.query.return_value.with_entities.assert_called_once()
+        mock_query_chain.filter.assert_not_called()
+        mock_query_chain.offset.assert_called_once_with(20)
+        mock_query_chain.limit.assert_called_once_with(2)
+    
+    def test_list_all_projection_aplica_filtros(
+        self,
+        repository,
+        mock_query_chain
+    ):
+        """Deve aplicar ILIKE em nome, email e documento (documento só com dígitos)."""
+        # Arrange
+        mock_query_chain.count.return_value = 0
+        mock_query_chain.all.return_value = []
+        
+        # Act
+        customers, total = repository.list_all_projection(
+            name="Ana",
+            email="@email",
+            document="123.456"
+        )
+        
+        # Assert
+        assert customers == []
+        assert total == 0
+        
+        filters = [_compile(c.args[0]) for c in mock_query_chain.filter.call_args_list]
+        assert filters == [
+            "lower(customers.name) LIKE lower('%Ana%')",
+            "lower(customers.email) LIKE lower('%@email%')",
+            "lower(customers.document) LIKE lower('%123456%')",
+        ]
@@ -3,16 +3,30 @@ Testes unitários para OrderRepository.
 Valida conversões Entity ↔ Model e operações de banco.
 """
 
+import re
 import pytest
 from decimal import Decimal
-from unittest.mock import MagicMock, Mock, call
+from unittest.mock import MagicMock, Mock, NonCallableMock, call
 from datetime import datetime
 
 from src.infrastructure.repositories.order_repository import OrderRepository
+from src.infrastructure.cache.memory_cache import InMemoryTTLCache
 from src.infrastructure.database.models import Order, OrderItem
 from src.domain.entities.order import OrderEntity
 from src.domain.entities.order_item import OrderItemEntity
 from src.core.constants import OrderStatus
+from src.domain.exceptions.business_exceptions import OrderNotFoundException
+
+
+# Linhas devolvidas pelo INSERT ... RETURNING dos itens (somente leitura)
+_RETURNED_ITEMS = (
+    OrderItem(id=1, order_id=1, product_id=10, unit_price=Decimal("15.50"), quantity=2, line_total=Decimal("31.00")),
+    OrderItem(id=2, order_id=1, product_id=20, unit_price=Decimal("25.00"), quantity=3, line_total=Decimal("75.00")),
+)
+
+
+# Mensagens de erro esperadas (regex compiladas uma única vez)
+_ORDER_NOT_FOUND = re.compile(r"Pedido 999 não encontrado")
 
 
 class TestOrderRepository:
@@ -23,47 +37,56 @@ class TestOrderRepository:
     # ==========================================
     
     @pytest.fixture
-    def mock_db_session(self):
-        """Mock da sessão do banco de dados."""
-        mock = MagicMock()
-        mock.query = MagicMock()
-        mock.add = MagicMock()
-        mock.commit = MagicMock()
-        mock.refresh = MagicMock()
-        mock.flush = MagicMock()
-        return mock
+    def mock_query_chain(self, mock_db_session):
+        """
+        Query encadeável já ligada a mock_db_session.query.
+        options/filter/offset/limit devolvem a própria query; cada teste define
+        apenas o retorno de first/all/count.
+        """
+        # A query em si nunca é chamada: NonCallableMock com atributos declarados
+        mock_query = NonCallableMock(
+            spec=["options", "filter", "offset", "limit", "first", "all", "count"]
+        )
+        for method in ("options", "filter", "offset", "limit"):
+            getattr(mock_query, method).return_value = mock_query
+        mock_db_session.query.return_value = mock_query
+        return mock_query
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def repository(self, mock_db_session):
-        """Instância do OrderRepository com mock."""
+        """Instância do OrderRepository com mock (sem cache, portanto sem estado)."""
         return OrderRepository(mock_db_session)
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def order_model_sample(self):
-        """Model de exemplo para testes."""
+        """
+        Model de exemplo para testes.
+        Compartilhado pelo módulo: os testes apenas leem o model (quem precisar
+        alterá-lo deve usar copy.deepcopy).
+        """
         # Criar items
         item1 = OrderItem(
             id=1,
             order_id=1,
             product_id=10,
-            unit_price=15.50,
+            unit_price=Decimal("15.50"),
             quantity=2,
-            line_total=31.00
+            line_total=Decimal("31.00")
         )
         item2 = OrderItem(
             id=2,
             order_id=1,
             product_id=20,
-            unit_price=25.00,
+            unit_price=Decimal("25.00"),
             quantity=3,
-            line_total=75.00
+            line_total=Decimal("75.00")
         )
         
         # Criar order
         order = Order(
             id=1,
             customer_id=5,
-            total_amount=106.00,
+            total_amount=Decimal("106.00"),
             status=OrderStatus.CREATED.value,
             idempotency_key="test-key-123",
             created_at=datetime(2024, 1, 15, 10, 30, 0),
@@ -75,66 +98,7 @@ class TestOrderRepository:
     # ==========================================
     # TESTES DE CONVERSÃO
     # ==========================================
-    '''   
-    def test_to_model_converte_entity_corretamente(
-        self,
-        repository,
-        order_factory,
-        order_item_factory
-    ):
-        """Deve converter OrderEntity para Order corretamente."""
-        # Arrange
-        items = [
-            order_item_factory(
-                id=None,
-                product_id=10,
-                unit_price=Decimal("15.50"),
-                quantity=2,
-                line_total=Decimal("31.00")
-            ),
-            order_item_factory(
-                id=None,
-                product_id=20,
-                unit_price=Decimal("25.00"),
-                quantity=3,
-                line_total=Decimal("75.00")
-            )
-        ]
-        
-        order_entity = order_factory(
-            id=None,
-            customer_id=5,
-            total_amount=Decimal("106.00"),
-            status=OrderStatus.CREATED.value,
-            idempotency_key="test-key-456",
-            items=items
-        )
-        
-        # Act
-        order_model = repository._to_model(order_entity)
-        
-        # Assert - Dados do pedido
-        assert order_model.customer_id == 5
-        assert order_model.total_amount == 106.00
-        assert order_model.status == OrderStatus.CREATED.value
-        assert order_model.idempotency_key == "test-key-456"
-        
-        # Assert - Items
-        assert len(order_model.items) == 2
-        
-        # Item 1
-        assert order_model.items[0].product_id == 10
-        assert order_model.items[0].unit_price == 15.50
-        assert order_model.items[0].quantity == 2
-        assert order_model.items[0].line_total == 31.00
-        
-        # Item 2
-        assert order_model.items[1].product_id == 20
-        assert order_model.items[1].unit_price == 25.00
-        assert order_model.items[1].quantity == 3
-        assert order_model.items[1].line_total == 75.00
-    '''
-
+    
     def test_to_entity_converte_model_corretamente(
         self,
         repository,
@@ -186,11 +150,8 @@ class TestOrderRepository:
         # Arrange
         order_id = 1
         
-        # Mock query chain
-        mock_query = MagicMock()
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = order_model_sample
-        mock_db_session.query.return_value = mock_query
+        # Mock: Session.get (consulta o identity map antes do banco)
+        mock_db_session.get.return_value = order_model_sample
         
         # Act
         result = repository.get_by_id(order_id)
@@ -203,13 +164,16 @@ class TestOrderRepository:
         assert result.total_amount == Decimal("106.00")
         assert len(result.items) == 2
         
-        # Verificar que query foi chamada corretamente
-        mock_db_session.query.assert_called_once()
+        # Verificar que a busca foi feita pela chave primária
+        mock_db_session.get.assert_called_once()
+        assert mock_db_session.get.call_args[0] == (Order, order_id)
+        mock_db_session.query.assert_not_called()
     
     def test_get_by_idempotency_key_retorna_entity(
         self,
         repository,
         mock_db_session,
+        mock_query_chain,
         order_model_sample
     ):
         """Deve buscar pedido por idempotency_key e retornar Entity."""
@@ -217,10 +181,7 @@ class TestOrderRepository:
         idempotency_key = "test-key-123"
         
         # Mock query chain
-        mock_query = MagicMock()
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = order_model_sample
-        mock_db_session.query.return_value = mock_query
+        mock_query_chain.first.return_value = order_model_sample
         
         # Act
         result = repository.get_by_idempotency_key(idempotency_key)
@@ -243,11 +204,8 @@ class TestOrderRepository:
         # Arrange
         order_id = 999
         
-        # Mock query chain (retorna None)
-        mock_query = MagicMock()
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None
-        mock_db_session.query.return_value = mock_query
+        # Mock: Session.get não encontra o pedido
+        mock_db_session.get.return_value = None
         
         # Act
         result = repository.get_by_id(order_id)
@@ -255,6 +213,41 @@ class TestOrderRepository:
         # Assert
         assert result is None
     
+    def test_get_by_idempotency_key_usa_cache(
+        self,
+        mock_db_session,
+        mock_query_chain,
+        order_model_sample
+    ):
+        """Deve consultar o banco apenas na primeira busca pela mesma key."""
+        # Arrange
+        repository = OrderRepository(mock_db_session, cache=InMemoryTTLCache())
+        
+        mock_query_chain.first.return_value = order_model_sample
+        
+        # Act
+        first = repository.get_by_idempotency_key("test-key-123")
+        second = repository.get_by_idempotency_key("test-key-123")
+        
+        # Assert
+        assert first.id == second.id == 1
+        assert second is not first  # cache devolve cópia, não o mesmo objeto
+        mock_db_session.query.assert_called_once()
+    
+    def test_lock_idempotency_key_usa_advisory_lock(
+        self,
+        repository,
+        mock_db_session
+    ):
+        """Deve adquirir pg_advisory_xact_lock sobre o hash da key."""
+        # Act
+        repository.lock_idempotency_key("test-key-123")
+        
+        # Assert
+        mock_db_session.execute.assert_called_once()
+        stmt = mock_db_session.execute.call_args[0][0]
+        assert "pg_advisory_xact_lock(hashtext(" in str(stmt)
+    
     # ==========================================
     # TESTES DE CRIAÇÃO
     # ==========================================
@@ -279,27 +272,16 @@ class TestOrderRepository:
             idempotency_key="create-test"
         )
         
-        # Mock: Simular que após add, o model recebe ID
+        # Mock: Simular que após add (e flush), o Pedido recebe ID
+        # Os itens não passam por add: vêm do INSERT ... RETURNING abaixo
         def mock_add_side_effect(model):
-            # Verifica se o objeto sendo adicionado é o Pedido (que tem a lista de itens)
-            if hasattr(model, 'idempotency_key'):
-                model.id = 1
-                from src.infrastructure.database.models import OrderItem
-                model.items = [
-                    OrderItem(id=1, product_id=10, unit_price=15.50, quantity=2, line_total=31.00),
-                    OrderItem(id=2, product_id=20, unit_price=25.00, quantity=3, line_total=75.00)
-                    ]
-            elif hasattr(model, 'product_id'):
+            if isinstance(model, Order):
                 model.id = 1
         
         mock_db_session.add.side_effect = mock_add_side_effect
         
-        # Mock refresh para simular reload do banco
-        def mock_refresh_side_effect(model):
-            # Já tem os IDs setados pelo add
-            pass
-        
-        mock_db_session.refresh.side_effect = mock_refresh_side_effect
+        # Mock: INSERT ... RETURNING dos itens devolve as linhas criadas
+        mock_db_session.scalars.return_value.all.return_value = list(_RETURNED_ITEMS)
         
         # Act
         result = repository.create(order_entity)
@@ -311,10 +293,58 @@ class TestOrderRepository:
         assert result.customer_id == 5
         assert len(result.items) == 2
         
-        # Verificar que add e commit foram chamados
-        assert mock_db_session.add.call_count == 3
+        assert [item.id for item in result.items] == [1, 2]
+        
+        # Verificar a sequência de chamadas na sessão de uma vez só:
+        # apenas o pedido passa por add, os itens vão em um único
+        # INSERT ... RETURNING e não há refresh após o commit
+        method_names = [name for name, _, _ in mock_db_session.method_calls]
+        assert method_names == ["add", "flush", "scalars", "commit"]
+        _, item_rows = mock_db_session.scalars.call_args[0]
+        assert [row["product_id"] for row in item_rows] == [10, 20]
+        assert all(row["order_id"] == 1 for row in item_rows)
+    
+    # ==========================================
+    # TESTES DE ATUALIZAÇÃO
+    # ==========================================
+    
+    def test_update_executa_update_unico(
+        self,
+        repository,
+        mock_db_session,
+        order_factory
+    ):
+        """Deve atualizar pedido com um único UPDATE, sem SELECT prévio."""
+        # Arrange
+        order_entity = order_factory(id=1, status=OrderStatus.PAID.value)
+        mock_db_session.execute.return_value.rowcount = 1
+        
+        # Act
+        result = repository.update(order_entity)
+        
+        # Assert
+        assert result is order_entity
+        mock_db_session.execute.assert_called_once()
         mock_db_session.commit.assert_called_once()
-        mock_db_session.refresh.assert_called_once()
+        mock_db_session.get.assert_not_called()
+        mock_db_session.query.assert_not_called()
+    
+    def test_update_pedido_inexistente_lanca_excecao(
+        self,
+        repository,
+        mock_db_session,
+        order_factory
+    ):
+        """Deve lançar exceção se o UPDATE não afetar nenhuma linha."""
+        # Arrange
+        order_entity = order_factory(id=999)
+        mock_db_session.execute.return_value.rowcount = 0
+        
+        # Act & Assert
+        with pytest.raises(OrderNotFoundException, match=_ORDER_NOT_FOUND):
+            repository.update(order_entity)
+        
+        mock_db_session.commit.assert_not_called()
     
     # ==========================================
     # TESTES DE LISTAGEM
@@ -327,21 +357,11 @@ class TestOrderRepository:
         order_model_sample
     ):
         """Deve retornar tupla (lista, total) na listagem."""
-        # 1. Criar o mock da query principal que suporta todos os métodos encadeados
-        mock_query = MagicMock()
-        
-        # 2. Configurar o encadeamento para que cada método retorne o próprio mock
-        mock_query.filter.return_value = mock_query
-        mock_query.offset.return_value = mock_query
-        mock_query.limit.return_value = mock_query
-        
-        # 3. Definir os retornos dos métodos executores (count e all)
-        mock_query.count.return_value = 25
-        mock_query.all.return_value = [order_model_sample]
-        
-        # 4. Configurar a sessão para retornar este mock em qualquer chamada de query
-        mock_db_session.query.return_value = mock_query
-        mock_db_session.query.side_effect = None  # Limpa qualquer side_effect anterior
+        # Cada linha traz o model e o total calculado por COUNT(*) OVER ()
+        row = MagicMock()
+        row.__getitem__.return_value = order_model_sample
+        row.total = 25
+        mock_db_session.execute.return_value.all.return_value = [row]
 
         # Act
         result = repository.list_all(skip=0, limit=10)
@@ -357,9 +377,9 @@ class TestOrderRepository:
         assert isinstance(orders[0], OrderEntity)
         assert orders[0].id == 1
         
-        # Verificar total retornado pelo count()
+        # Verificar total retornado pela window function
         assert total == 25
         
-        # Como o objeto query é reaproveitado pelo repositório, validamos
-        # que a sessão abriu a query para Order uma vez
-        assert mock_db_session.query.call_count == 1
\ No newline at end of file
+        # Lista e total vêm de uma única query
+        mock_db_session.execute.assert_called_once()
+        mock_db_session.query.assert_not_called()
\ No newline at end of file
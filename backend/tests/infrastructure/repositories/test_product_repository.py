@@ -0,0 +1,270 @@
+"""
+Testes unitários para ProductRepository.
+Valida as consultas do repositório e as conversões para entity.
+"""
+
+import re
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy.dialects import postgresql
+
+from src.infrastructure.repositories.product_repository import ProductRepository
+from src.infrastructure.database.models import Product
+from src.domain.entities.product import ProductEntity
+from src.domain.exceptions.business_exceptions import (
+    ProductNotFoundException,
+    DuplicateSKUException
+)
+
+
+# Timestamps devolvidos pelo "banco" (RETURNING / projeção)
+_CREATED_AT = datetime(2024, 1, 15, 10, 30, 0)
+_UPDATED_AT = datetime(2024, 1, 16, 8, 0, 0)
+
+# Mensagens de erro esperadas (regex compiladas uma única vez)
+_PRODUCT_NOT_FOUND = re.compile(r"Produto com ID 999 não encontrado")
+_DUPLICATE_SKU = re.compile(r"SKU 'TEST-001' já existe")
+
+
+def _product_row(**overrides) -> dict:
+    """Linha projetada de produtos (mesmas chaves de _LIST_COLUMNS)."""
+    row = {
+        "id": 1,
+        "name": "Produto Teste",
+        "sku": "TEST-001",
+        "price": Decimal("10.00"),
+        "stock_qty": 100,
+        "is_active": True,
+        "created_at": _CREATED_AT,
+        "updated_at": None,
+    }
+    row.update(overrides)
+    return row
+
+
+class TestProductRepository:
+    """Testes do ProductRepository."""
+    
+    # ==========================================
+    # FIXTURES LOCAIS
+    # ==========================================
+    
+    @pytest.fixture(scope="class")
+    def repository(self, mock_db_session):
+        """Instância do ProductRepository com mock."""
+        return ProductRepository(mock_db_session)
+    
+    # ==========================================
+    # TESTES DE CRIAÇÃO
+    # ==========================================
+    
+    def test_create_retorna_entity_da_linha_inserida(
+        self,
+        repository,
+        mock_db_session,
+        product_factory
+    ):
+        """Deve converter a linha do INSERT ... RETURNING e commitar."""
+        # Arrange
+        mock_db_session.scalars.return_value.first.return_value = Product(**_product_row(id=7))
+        
+        # Act
+        result = repository.create(product_factory(id=None))
+        
+        # Assert
+        assert isinstance(result, ProductEntity)
+        assert result.id == 7
+        assert result.created_at == _CREATED_AT
+        mock_db_session.commit.assert_called_once()
+        
+        # Unicidade do SKU garantida pelo próprio INSERT, sem SELECT prévio
+        stmt = mock_db_session.scalars.call_args[0][0]
+        assert "ON CONFLICT (sku) DO NOTHING" in str(stmt.compile(dialect=postgresql.dialect()))
+        mock_db_session.query.assert_not_called()
+    
+    def test_create_sku_duplicado_lanca_excecao(
+        self,
+        repository,
+        mock_db_session,
+        product_factory
+    ):
+        """Deve lançar exceção quando o ON CONFLICT não insere nenhuma linha."""
+        # Arrange
+        mock_db_session.scalars.return_value.first.return_value = None
+        
+        # Act & Assert
+        with pytest.raises(DuplicateSKUException, match=_DUPLICATE_SKU):
+            repository.create(product_factory(id=None))
+        
+        mock_db_session.commit.assert_not_called()
+    
+    # ==========================================
+    # TESTES DE ATUALIZAÇÃO
+    # ==========================================
+    
+    def test_update_retorna_linha_gravada(
+        self,
+        repository,
+        mock_db_session,
+        product_factory
+    ):
+        """Deve devolver a linha do RETURNING, com o updated_at gerado pelo banco."""
+        # Arrange
+        product = product_factory(name="Novo Nome")
+        mock_db_session.scalar.return_value = False  # Sem conflito de SKU
+        mock_db_session.execute.return_value.mappings.return_value.first.return_value = (
+            _product_row(name="Novo Nome", updated_at=_UPDATED_AT)
+        )
+        
+        # Act
+        result = repository.update(product)
+        
+        # Assert
+        assert result is not product
+        assert result.name == "Novo Nome"
+        assert result.updated_at == _UPDATED_AT
+        
+        # Um único UPDATE ... RETURNING, sem SELECT prévio do produto
+        mock_db_session.execute.assert_called_once()
+        stmt = mock_db_session.execute.call_args[0][0]
+        assert "RETURNING" in str(stmt)
+        mock_db_session.get.assert_not_called()
+    
+    def test_update_produto_inexistente_lanca_excecao(
+        self,
+        repository,
+        mock_db_session,
+        product_factory
+    ):
+        """Deve lançar exceção se o UPDATE não devolver nenhuma linha."""
+        # Arrange
+        mock_db_session.scalar.return_value = False
+        mock_db_session.execute.return_value.mappings.return_value.first.return_value = None
+        
+        # Act & Assert
+        with pytest.raises(ProductNotFoundException, match=_PRODUCT_NOT_FOUND):
+            repository.update(product_factory(id=999))
+    
+    def test_update_sku_duplicado_lanca_excecao(
+        self,
+        repository,
+        mock_db_session,
+        product_factory
+    ):
+        """Deve lançar exceção e não executar o UPDATE se o SKU já existe em outro produto."""
+        # Arrange
+        mock_db_session.scalar.return_value = True
+        
+        # Act & Assert
+        with pytest.raises(DuplicateSKUException, match=_DUPLICATE_SKU):
+            repository.update(product_factory())
+        
+        # Conflito verificado com um único SELECT EXISTS, sem carregar linhas
+        mock_db_session.scalar.assert_called_once()
+        check = str(mock_db_session.scalar.call_args[0][0])
+        assert check.startswith("SELECT EXISTS")
+        mock_db_session.query.assert_not_called()
+        mock_db_session.execute.assert_not_called()
+    
+    # ==========================================
+    # TESTES DE REMOÇÃO
+    # ==========================================
+    
+    @pytest.mark.parametrize("rowcount,expected", [(1, True), (0, False)])
+    def test_delete_soft_delete_com_update_unico(
+        self,
+        repository,
+        mock_db_session,
+        rowcount,
+        expected
+    ):
+        """Deve marcar como inativo com um único UPDATE e informar se achou o produto."""
+        # Arrange
+        mock_db_session.execute.return_value.rowcount = rowcount
+        
+        # Act
+        result = repository.delete(1)
+        
+        # Assert
+        assert result is expected
+        mock_db_session.execute.assert_called_once()
+        mock_db_session.commit.assert_called_once()
+        mock_db_session.get.assert_not_called()
+        
+        # Soft delete: UPDATE de is_active, nunca DELETE
+        stmt = str(mock_db_session.execute.call_args[0][0])
+        assert stmt.startswith("UPDATE products SET is_active=")
+    
+    # ==========================================
+    # TESTES DE LISTAGEM
+    # ==========================================
+    
+    def test_list_all_usa_total_da_window_function(
+        self,
+        repository,
+        mock_db_session
+    ):
+        """Deve montar entities da projeção e usar o total do COUNT(*) OVER ()."""
+        # Arrange
+        mock_db_session.execute.return_value.mappings.return_value.all.return_value = [
+            {**_product_row(id=1), "total": 42},
+            {**_product_row(id=2, sku="TEST-002"), "total": 42},
+        ]
+        
+        # Act
+        products, total = repository.list_all(skip=0, limit=2)
+        
+        # Assert
+        assert [p.id for p in products] == [1, 2]
+        assert all(isinstance(p, ProductEntity) for p in products)
+        assert total == 42
+        mock_db_session.execute.assert_called_once()
+        mock_db_session.scalar.assert_not_called()
+        
+        # Projeção direta: sem hidratar models do ORM
+        mock_db_session.query.assert_not_called()
+        mock_db_session.scalars.assert_not_called()
+    
+    def test_list_all_pagina_alem_do_fim_conta_a_parte(
+        self,
+        repository,
+        mock_db_session
+    ):
+        """Deve contar à parte quando a página pedida não traz linhas."""
+        # Arrange
+        mock_db_session.execute.return_value.mappings.return_value.all.return_value = []
+        mock_db_session.scalar.return_value = 42
+        
+        # Act
+        products, total = repository.list_all(skip=100, limit=20)
+        
+        # Assert
+        assert products == []
+        assert total == 42
+        mock_db_session.scalar.assert_called_once()
+    
+    @pytest.mark.parametrize("order_by,direction,expected", [
+        ("price", "asc", "ORDER BY products.price ASC"),
+        ("name", "desc", "ORDER BY products.name DESC"),
+        # Campo fora da whitelist cai em created_at
+        ("password; DROP TABLE products", "desc", "ORDER BY products.created_at DESC"),
+    ])
+    def test_list_all_ordena_apenas_por_colunas_da_whitelist(
+        self,
+        repository,
+        mock_db_session,
+        order_by,
+        direction,
+        expected
+    ):
+        """Deve ordenar pelas colunas permitidas e ignorar campos não permitidos."""
+        # Arrange
+        mock_db_session.execute.return_value.mappings.return_value.all.return_value = []
+        
+        # Act
+        repository.list_all(order_by=order_by, order_direction=direction)
+        
+        # Assert
+        stmt = mock_db_session.execute.call_args[0][0]
+        assert expected in str(stmt)